@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+장시간 조회 시 selenium-wire 캡쳐 메모리 확인
+
+대역 서버에 N번 재조회하면서 파이썬 프로세스 RSS 와 보관 중인 캡쳐 요청 수를 주기적으로 출력한다.
+캡쳐 범위와 버퍼 크기가 제한되어 있으면 두 값 모두 평탄해야 한다.
+--max-growth 를 넘으면 종료 코드 1 을 반환한다.
+
+    python benchmarks/bench_capture.py --refreshes 10000 --netfunnel-every 5
+"""
+import argparse
+import sys
+
+from benchutil import rss_mb, tomorrow
+from mock_srt import MockSRT, serve
+from srt_reservation.main import SRT
+from srt_reservation.snapshot import read_result_rows
+from srt_reservation.util import parse_cli_args
+
+
+def main():
+    parser = argparse.ArgumentParser(description="selenium-wire capture memory soak against the local stand-in server")
+    parser.add_argument("--refreshes", type=int, default=10000)
+    parser.add_argument("--sample-every", type=int, default=500)
+    parser.add_argument("--netfunnel-every", type=int, default=5)
+    parser.add_argument("--max-growth", type=float, default=None, help="fail if RSS grows more than this (MB)")
+    cli, extra = parser.parse_known_args()
+
+    mock = MockSRT(open_at=float("inf"), netfunnel_every=cli.netfunnel_every, netfunnel_ms=50)
+    server, base_url = serve(mock)
+
+    args = parse_cli_args(["--dpt", "동탄", "--arr", "동대구", "--dt", tomorrow(), "--tm", "08",
+                           "--base_url", base_url, "--headless", *extra])
+    srt = SRT(args)
+    srt.run_driver()
+    srt.set_log_info("1234567890", "mock")
+    srt.login()
+    srt.check_login()
+    srt.driver.get(f"{base_url}/hpg/hra/01/selectScheduleList.do?dptDt={tomorrow()}")
+
+    samples = []
+    for i in range(1, cli.refreshes + 1):
+        srt.submit_search()
+        read_result_rows(srt.driver)
+        if i % cli.sample_every == 0:
+            samples.append((i, rss_mb(), len(srt.driver.requests)))
+            print(f"새로고침 {i}회: RSS {samples[-1][1]:.1f}MB, 캡쳐 요청 {samples[-1][2]}개")
+    srt.driver.quit()
+    server.shutdown()
+
+    growth = samples[-1][1] - samples[0][1] if len(samples) > 1 else 0.0
+    print(f"RSS 증가량: {growth:.1f}MB")
+    sys.exit(1 if cli.max_growth is not None and growth > cli.max_growth else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+조회 사이클 벤치마크
+
+로컬 대역 서버(mock_srt.py)를 띄우고 headless 크롬으로 SRT.run 을 실행한 뒤
+사이클 시간 p50/p99, 좌석이 보인 후 예약까지 걸린 시간, 사이클당 드라이버 호출 수를 출력한다.
+--max-p99 / --max-book 을 주면 기준 초과 시 종료 코드 1 을 반환해 회귀 검사로 쓸 수 있다.
+
+    python benchmarks/bench_cycle.py --open-at 30 --max-p99 2.0
+"""
+import argparse
+import sys
+
+from benchutil import percentile, tomorrow
+from mock_srt import MockSRT, serve
+from srt_reservation.main import SRT
+from srt_reservation.util import parse_cli_args
+
+
+def run_once(mock, base_url, extra_args=()):
+    """SRT.run 을 한 번 실행하고 (사이클 간격 목록, 예약까지 걸린 시간, 사이클당 드라이버 호출 수) 반환"""
+    mock.reset()
+    args = parse_cli_args(["--dpt", "동탄", "--arr", "동대구", "--dt", tomorrow(), "--tm", "08", "--num", "5",
+                           "--base_url", base_url, "--headless", *extra_args])
+    srt = SRT(args)
+
+    driver_calls = []
+    run_driver = srt.run_driver
+
+    def run_driver_recording():
+        run_driver()
+        reset = srt.driver_calls.reset
+
+        def reset_recording():
+            count = reset()
+            driver_calls.append(count)
+            return count
+
+        srt.driver_calls.reset = reset_recording
+
+    srt.run_driver = run_driver_recording
+    srt.run("1234567890", "mock")
+
+    times = mock.search_times
+    cycles = [b - a for a, b in zip(times, times[1:])]
+    time_to_book = mock.booked_times[0] - mock.first_seen if mock.booked_times and mock.first_seen else None
+    return cycles, time_to_book, driver_calls[1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SRT poll-cycle benchmark against the local stand-in server")
+    parser.add_argument("--open-at", type=float, default=30.0, help="seconds until a seat appears")
+    parser.add_argument("--netfunnel-every", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--max-p99", type=float, default=None, help="fail if p99 cycle time exceeds this (s)")
+    parser.add_argument("--max-book", type=float, default=None, help="fail if time-to-book exceeds this (s)")
+    cli, extra = parser.parse_known_args()
+
+    mock = MockSRT(open_at=cli.open_at, netfunnel_every=cli.netfunnel_every)
+    server, base_url = serve(mock)
+
+    cycles, books, calls = [], [], []
+    for _ in range(cli.runs):
+        mock.seats = 1
+        run_cycles, time_to_book, run_calls = run_once(mock, base_url, extra)
+        cycles += run_cycles
+        calls += run_calls
+        if time_to_book is not None:
+            books.append(time_to_book)
+    server.shutdown()
+
+    p50, p99 = percentile(cycles, 50), percentile(cycles, 99)
+    book = max(books) if books else float("nan")
+    print("============================")
+    print(f"사이클 수: {len(cycles)}")
+    print(f"사이클 시간 p50: {p50:.3f}s, p99: {p99:.3f}s")
+    print(f"좌석 노출 후 예약까지: {book:.3f}s")
+    if calls:
+        print(f"사이클당 드라이버 호출: 평균 {sum(calls) / len(calls):.1f}, 최대 {max(calls)}")
+    print("============================")
+
+    failed = (cli.max_p99 is not None and not p99 <= cli.max_p99) or \
+             (cli.max_book is not None and not book <= cli.max_book)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
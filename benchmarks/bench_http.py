@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+브라우저 조회 vs HTTP 조회(--http_poll) 비교
+
+같은 대역 서버에 두 방식으로 각각 N번 조회하고 조회당 CPU 시간(크롬 프로세스 트리 + 파이썬 프로세스)과
+조회 시간 p50 을 비교한다. 대역 서버는 실제 사이트처럼 조회마다 NetFunnel 키를 요구하고
+--netfunnel-every 번째 키 발급마다 대기열에 세우므로, 대기열이 뜬 조회는 브라우저로 넘어간 만큼 반영된다.
+
+    python benchmarks/bench_http.py --refreshes 200 --netfunnel-every 20
+"""
+import argparse
+import time
+
+from benchutil import percentile, process_tree_cpu, tomorrow
+from mock_srt import MockSRT, serve
+from srt_reservation.main import SRT
+from srt_reservation.util import parse_cli_args
+
+
+def measure(mock, base_url, refreshes, extra_args):
+    args = parse_cli_args(["--dpt", "동탄", "--arr", "동대구", "--dt", tomorrow(), "--tm", "08",
+                           "--base_url", base_url, "--headless", *extra_args])
+    srt = SRT(args)
+    srt.set_log_info("1234567890", "mock")
+    srt.start_browser()
+    srt.fill_search_form()
+    srt.submit_search()
+    mock.reset()
+
+    pid = srt.driver.service.process.pid
+    cpu_start = process_tree_cpu(pid) + time.process_time()
+    latencies = []
+    for _ in range(refreshes):
+        start = time.monotonic()
+        srt.refresh()
+        srt.polled = None
+        latencies.append(time.monotonic() - start)
+    cpu = process_tree_cpu(pid) + time.process_time() - cpu_start
+    srt.driver.quit()
+    handoffs = srt.metrics.counters.get("http_netfunnel_handoffs", 0)
+    return cpu / refreshes, percentile(latencies, 50), handoffs, mock.queued, mock.rejected_searches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU and latency per check, browser vs --http_poll")
+    parser.add_argument("--refreshes", type=int, default=200)
+    parser.add_argument("--netfunnel-every", type=int, default=20, help="queue every Nth NetFunnel key (0: never)")
+    parser.add_argument("--netfunnel-ms", type=int, default=200)
+    cli, extra = parser.parse_known_args()
+
+    mock = MockSRT(open_at=float("inf"), netfunnel_every=cli.netfunnel_every, netfunnel_ms=cli.netfunnel_ms)
+    server, base_url = serve(mock)
+    results = {
+        "브라우저": measure(mock, base_url, cli.refreshes, extra),
+        "HTTP": measure(mock, base_url, cli.refreshes, [*extra, "--http_poll"]),
+    }
+    server.shutdown()
+
+    print("============================")
+    for name, (cpu, p50, handoffs, queued, rejected) in results.items():
+        print(f"{name}: 조회당 CPU {cpu * 1000:.1f}ms, 조회 시간 p50 {p50 * 1000:.1f}ms, "
+              f"대기열 {queued}회 (브라우저로 넘김 {handoffs}회), 키 없이 거부된 조회 {rejected}회")
+    browser_cpu = results["브라우저"][0]
+    http_cpu = results["HTTP"][0]
+    print(f"CPU {http_cpu / browser_cpu:.2f}배")
+    print("============================")
+
+
+if __name__ == "__main__":
+    main()
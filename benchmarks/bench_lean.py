@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+lean 모드 전후 비교
+
+같은 대역 서버에 일반 모드와 --lean 모드로 각각 N번 재조회하고
+사이클당 크롬 프로세스 트리 CPU 시간과 서버가 보낸 바이트 수를 비교한다.
+
+    python benchmarks/bench_lean.py --refreshes 200
+"""
+import argparse
+
+from benchutil import process_tree_cpu, tomorrow
+from mock_srt import MockSRT, serve
+from srt_reservation.main import SRT
+from srt_reservation.snapshot import read_result_rows
+from srt_reservation.util import parse_cli_args
+
+
+def measure(mock, base_url, refreshes, extra_args):
+    args = parse_cli_args(["--dpt", "동탄", "--arr", "동대구", "--dt", tomorrow(), "--tm", "08",
+                           "--base_url", base_url, "--headless", *extra_args])
+    srt = SRT(args)
+    srt.run_driver()
+    srt.set_log_info("1234567890", "mock")
+    srt.login()
+    srt.check_login()
+    srt.driver.get(f"{base_url}/hpg/hra/01/selectScheduleList.do?dptDt={tomorrow()}")
+
+    pid = srt.driver.service.process.pid
+    mock.reset()
+    cpu_start = process_tree_cpu(pid)
+    for _ in range(refreshes):
+        srt.submit_search()
+        read_result_rows(srt.driver)
+    cpu = process_tree_cpu(pid) - cpu_start
+    sent = mock.bytes_sent
+    srt.driver.quit()
+    return cpu / refreshes, sent / refreshes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU and bytes per refresh, default vs --lean")
+    parser.add_argument("--refreshes", type=int, default=200)
+    cli, extra = parser.parse_known_args()
+
+    mock = MockSRT(open_at=float("inf"))
+    server, base_url = serve(mock)
+    results = {
+        "기본": measure(mock, base_url, cli.refreshes, extra),
+        "lean": measure(mock, base_url, cli.refreshes, [*extra, "--lean"]),
+    }
+    server.shutdown()
+
+    print("============================")
+    for name, (cpu, sent) in results.items():
+        print(f"{name}: 사이클당 CPU {cpu * 1000:.1f}ms, 전송 {sent / 1024:.1f}KB")
+    base_cpu, base_sent = results["기본"]
+    lean_cpu, lean_sent = results["lean"]
+    print(f"CPU {lean_cpu / base_cpu:.2f}배, 전송량 {lean_sent / base_sent:.2f}배")
+    print("============================")
+
+
+if __name__ == "__main__":
+    main()
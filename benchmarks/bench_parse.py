@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+조회 결과/예약 확인 페이지 파싱 속도 (브라우저 없이)
+
+benchmarks/fixtures 에 저장된 페이지(예약하기, 매진, 신청하기, 좌석부족, 예약 확인 성공/실패)를 먼저 파싱해
+좌석 상태와 판단(SelectionPolicy.decide, 3명 부분 예약)이 기대와 같은지 확인한 뒤,
+페이지마다 --iterations 번 파싱해 페이지당 시간 p50/p99 와 초당 페이지 수를 출력한다.
+확인이 틀리거나 p50 이 --max-ms 를 넘으면 종료 코드 1 을 반환한다.
+
+    python benchmarks/bench_parse.py --iterations 2000 --max-ms 5
+"""
+import argparse
+import os
+import sys
+import time
+
+from benchutil import percentile
+from srt_reservation.parsing import parse_confirmation, parse_schedule
+from srt_reservation.policy import SelectionPolicy
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 조회 결과 페이지: (303 열차 일반실 상태, 판단 결과, 인원 축소 여부)
+SCHEDULES = {
+    "schedule_available": ("예약하기", [["303", "standard"]], False),
+    "schedule_sold_out": ("매진", [], False),
+    "schedule_waitlist": ("매진", [["303", "reserve"]], False),
+    "schedule_short": ("좌석부족", [], True),
+}
+# 예약 확인 페이지: (성공 여부, 출발 시간)
+CONFIRMATIONS = {
+    "confirmation": (True, "08:20"),
+    "confirmation_failed": (False, ""),
+}
+
+
+def load(name):
+    with open(os.path.join(FIXTURES, f"{name}.html"), "rb") as f:
+        return f.read()
+
+
+def check(pages):
+    """저장된 페이지마다 파싱 결과가 기대와 같은지. 틀린 내용 목록을 반환"""
+    policy = SelectionPolicy(earliest="08:00", max_trains=5, waitlist=True)
+    errors = []
+    for name, (state, expected_choices, expected_shrink) in SCHEDULES.items():
+        rows = parse_schedule(pages[name]) or []
+        row = next((row for row in rows if row.train_no == "303"), None)
+        ranked, shrink = policy.decide(rows, 3, True)
+        choices = [[row.train_no, seat_class] for row, seat_class in ranked]
+        if row is None or row.standard != state or choices != expected_choices or shrink != expected_shrink:
+            errors.append(f"{name}: 303 일반실 {row and row.standard!r}, 판단 {choices}, 축소 {shrink}")
+    for name, (success, dpt_tm) in CONFIRMATIONS.items():
+        confirmation = parse_confirmation(pages[name])
+        if confirmation.success != success or confirmation.dpt_tm != dpt_tm:
+            errors.append(f"{name}: {confirmation!r}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline parse throughput on saved pages")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if any page's p50 exceeds this (ms)")
+    cli = parser.parse_args()
+
+    pages = {name: load(name) for name in [*SCHEDULES, *CONFIRMATIONS]}
+    errors = check(pages)
+    for error in errors:
+        print(f"FAIL: {error}")
+
+    print("============================")
+    slow = False
+    for name, html in pages.items():
+        parse = parse_schedule if name in SCHEDULES else parse_confirmation
+        timings = []
+        for _ in range(cli.iterations):
+            start = time.perf_counter()
+            parse(html)
+            timings.append(time.perf_counter() - start)
+        p50 = percentile(timings, 50)
+        print(f"{name:22s} {len(html) / 1024:6.1f}KB  p50 {p50 * 1000:6.3f}ms  "
+              f"p99 {percentile(timings, 99) * 1000:6.3f}ms  {1 / p50:8.0f} 페이지/초")
+        if cli.max_ms is not None and p50 * 1000 > cli.max_ms:
+            slow = True
+    print("============================")
+    if slow:
+        print(f"FAIL: p50 이 {cli.max_ms}ms 를 넘는 페이지가 있음")
+    sys.exit(1 if errors or slow else 0)
+
+
+if __name__ == "__main__":
+    main()
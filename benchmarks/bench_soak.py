@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+장시간 실행(soak) 벤치마크
+
+대역 서버에 재조회를 반복하며 사이클 지연과 크롬 프로세스 트리 메모리(PSS)가 시간에 따라 늘어나는지 본다.
+모의 시간 --hours 시간 분량의 사이클을 쉬지 않고 돌린다. 실제 운영의 사이클 하나는 조회 지연 + 스케줄러가
+조회 사이에 쉬는 평균 간격(--max_rate, 지터 반영)이므로, 워밍업 사이클로 잰 지연과 그 간격으로
+시간당 사이클 수를 정한다 (기본 --max_rate 120 이면 하루 약 10만 사이클). --interval 로 직접 줄 수도 있다.
+사이클마다 ResourceGovernor 에 지연을 알려 탭/브라우저를 재활용한다.
+모의 1시간마다 지연 p50/p99 와 메모리를 출력하고, 마지막 시간대가 첫 시간대보다 --max-drift 배 이상 느리거나
+메모리가 --max-rss-growth MB 이상 늘면 종료 코드 1 을 반환한다.
+
+    python benchmarks/bench_soak.py --hours 24
+    python benchmarks/bench_soak.py --hours 24 --max_rss 1024   # 메모리 상한으로 브라우저 재시작
+    python benchmarks/bench_soak.py --hours 24 --latency_drift 0   # 재활용 없이 비교
+"""
+import argparse
+import sys
+import time
+
+from benchutil import percentile, process_tree_memory, tomorrow
+from mock_srt import MockSRT, serve
+from srt_reservation.main import SRT
+from srt_reservation.snapshot import read_result_rows
+from srt_reservation.util import parse_cli_args
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-run latency and memory soak test against the local stand-in")
+    parser.add_argument("--hours", type=float, default=24.0, help="simulated hours")
+    parser.add_argument("--interval", type=float, default=None,
+                        help="simulated seconds per cycle (default: warm-up latency + scheduler's mean gap at --max_rate)")
+    parser.add_argument("--warmup", type=int, default=20, help="cycles used to measure latency before the run")
+    parser.add_argument("--max-drift", type=float, default=1.5, help="fail if last-hour p50 exceeds first-hour p50 by this factor")
+    parser.add_argument("--max-rss-growth", type=float, default=300.0, help="fail if Chrome memory (PSS) grows by more than this (MB)")
+    cli, extra = parser.parse_known_args()
+
+    mock = MockSRT(open_at=float("inf"))
+    server, base_url = serve(mock)
+    args = parse_cli_args(["--dpt", "동탄", "--arr", "동대구", "--dt", tomorrow(), "--tm", "08",
+                           "--base_url", base_url, "--headless", *extra])
+    srt = SRT(args)
+    srt.set_log_info("1234567890", "mock")
+    srt.start_browser()
+    srt.fill_search_form()
+
+    hours = []  # (지연 목록, 시간대 끝 메모리)
+    latencies = []
+    try:
+        interval = cli.interval
+        if interval is None:
+            warmup = []
+            for _ in range(cli.warmup):
+                start = time.monotonic()
+                srt.submit_search()
+                read_result_rows(srt.driver)
+                warmup.append(time.monotonic() - start)
+            scheduler = srt.scheduler
+            interval = percentile(warmup, 50) + scheduler.min_interval * (1 + scheduler.jitter / 2)
+        cycles_per_hour = max(1, round(3600 / interval))
+        total = round(cli.hours * cycles_per_hour)
+        print(f"사이클 {interval:.2f}초 -> 시간당 {cycles_per_hour}개, 총 {total}개")
+        for cycle in range(1, total + 1):
+            start = time.monotonic()
+            srt.submit_search()
+            read_result_rows(srt.driver)
+            latency = time.monotonic() - start
+            latencies.append(latency)
+            action = srt.governor.observe(latency)
+            if action is not None:
+                srt.recycle(action)
+            if cycle % cycles_per_hour == 0:
+                memory = process_tree_memory(srt.driver.service.process.pid)
+                hours.append((latencies, memory))
+                print(f"{len(hours):3d}시간: p50 {percentile(latencies, 50) * 1000:6.1f}ms "
+                      f"p99 {percentile(latencies, 99) * 1000:6.1f}ms 메모리 {memory:7.1f}MB")
+                latencies = []
+    finally:
+        srt.driver.quit()
+        server.shutdown()
+
+    counters = srt.metrics.counters
+    print("============================")
+    print(f"사이클 {total}개, 탭 재생성 {counters.get('recycles_tab', 0)}회, 브라우저 재시작 {counters.get('recycles_browser', 0)}회")
+    if len(hours) < 2:
+        print("============================")
+        return
+    first_p50, last_p50 = percentile(hours[0][0], 50), percentile(hours[-1][0], 50)
+    rss_growth = hours[-1][1] - hours[0][1]
+    print(f"지연 p50 {first_p50 * 1000:.1f}ms -> {last_p50 * 1000:.1f}ms ({last_p50 / first_p50:.2f}배), "
+          f"메모리 {rss_growth:+.1f}MB")
+    print("============================")
+    failed = False
+    if last_p50 > first_p50 * cli.max_drift:
+        print(f"FAIL: 지연이 {cli.max_drift}배 이상 늘어남")
+        failed = True
+    if rss_growth > cli.max_rss_growth:
+        print(f"FAIL: 메모리가 {cli.max_rss_growth}MB 이상 늘어남")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
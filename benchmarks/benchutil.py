@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""벤치마크 공용 함수"""
+import os
+import resource
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from srt_reservation.governor import process_tree_usage  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def rss_mb(pid="self"):
+    """프로세스의 현재 RSS (MB). /proc 이 없으면 최대 RSS 로 대신한다"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def tomorrow():
+    return (datetime.now() + timedelta(days=1)).strftime("%Y%m%d")
+
+
+def process_tree_cpu(pid):
+    """pid 와 모든 자식 프로세스의 누적 CPU 시간 (초, user + system)"""
+    return process_tree_usage(pid)[1]
+
+
+def process_tree_memory(pid):
+    """pid 와 모든 자식 프로세스의 메모리 PSS 합계 (MB)"""
+    return process_tree_usage(pid)[0]
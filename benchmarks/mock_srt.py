@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+로컬 SRT 대역 서버
+
+etk.srail.kr 대신 로그인 폼, 조회(selectScheduleList.do), NetFunnel 대기열(ts.wseq),
+예약 확인 페이지를 흉내낸다. 좌석은 지정한 시간이 지나면 매진 -> 예약하기 로 바뀐다.
+조회한 인원이 남은 좌석보다 많으면 예약하기 대신 좌석부족 으로 보여준다.
+
+실제 사이트처럼 조회하기를 누르면 페이지 스크립트가 NetFunnel 키를 받고, 대기열이면 대기 팝업을
+페이지에서 만들었다가 통과하면 키를 실어 조회한다. 조회 요청은 통과한 키가 없으면 결과를 돌려주지 않는다.
+
+    python benchmarks/mock_srt.py --port 8080 --open-at 30
+    python quickstart_telegram.py --base_url http://127.0.0.1:8080 ...
+"""
+import argparse
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SESSION_COOKIE = "JSESSIONID_ETK=mock-session"
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>SRT</title>
+<link rel="stylesheet" href="/css/common.css">
+<script src="/js/analytics.js"></script>
+<script>
+var NetFunnel = {{TS_HOST: location.hostname, TS_PORT: location.port, TS_PROTO: location.protocol.replace(':', ''),
+                 gLastData: {{key: ''}}}};
+</script>
+<style>@font-face {{ font-family: Nanum; src: url(/fonts/nanum.woff2); }} body {{ font-family: Nanum; }}</style>
+</head><body>
+<img src="/img/logo.png"><img src="/img/banner.jpg">
+{body}
+</body></html>"""
+
+# 실제 사이트처럼 매 페이지가 끌어오는 정적 리소스 (경로: (Content-Type, 크기))
+STATIC = {
+    "/css/common.css": ("text/css", b"/*" + b"-" * 40000 + b"*/"),
+    "/js/analytics.js": ("application/javascript", b"/*" + b"-" * 30000 + b"*/"),
+    "/fonts/nanum.woff2": ("font/woff2", b"\0" * 120000),
+    "/img/logo.png": ("image/png", b"\0" * 20000),
+    "/img/banner.jpg": ("image/jpeg", b"\0" * 80000),
+}
+
+LOGIN_FORM = """
+<form id="login-form" method="post" action="/cmc/01/selectLoginInfo.do"><fieldset>
+<div>
+  <div></div>
+  <div>
+    <div></div>
+    <div><div>
+      <div><input type="text" id="srchDvNm01" name="srchDvNo"><input type="password" id="hmpgPwdCphd01" name="hmpgPwd"></div>
+      <div><input type="submit" value="확인"></div>
+    </div></div>
+  </div>
+</div>
+</fieldset></form>"""
+
+SEARCH_FORM = """
+<form id="search-form" method="get" action="/hpg/hra/01/selectScheduleList.do"><fieldset>
+<input type="text" id="dptRsStnCdNm" name="dptRsStnCdNm" value="{dpt}">
+<input type="text" id="arvRsStnCdNm" name="arvRsStnCdNm" value="{arr}">
+<select id="dptDt" name="dptDt" style="display: none;">{dates}</select>
+<select id="dptTm" name="dptTm" style="display: none;">{times}</select>
+<select id="psgInfoPerPrnb1" name="psgInfoPerPrnb1" style="display: none;">{counts}</select>
+<select id="psgInfoPerPrnb4" name="psgInfoPerPrnb4" style="display: none;">{counts}</select>
+<select id="psgInfoPerPrnb5" name="psgInfoPerPrnb5" style="display: none;">{counts}</select>
+<input type="hidden" id="netfunnelKey" name="netfunnelKey" value="">
+<input type="submit" value="조회하기">
+</fieldset></form>
+<script>
+// netfunnel.js 흉내: 키를 받고, 대기열이면 팝업을 띄워 통과할 때까지 다시 묻고, 통과하면 키를 실어 조회
+document.getElementById('search-form').addEventListener('submit', function (event) {{
+    event.preventDefault();
+    var form = this;
+    function ask(opcode, key) {{
+        fetch('/ts.wseq?opcode=' + opcode + '&sid=service_1&aid=act_10&nfid=0&js=true' + (key ? '&key=' + key : ''))
+            .then(function (response) {{ return response.text(); }})
+            .then(function (text) {{
+                var result = /result='([0-9]+):([0-9]+):key=([^&']+)/.exec(text);
+                var popup = document.getElementById('NetFunnel_Loading_Popup');
+                if (result[2] === '201') {{
+                    if (!popup) {{
+                        popup = document.createElement('div');
+                        popup.id = 'NetFunnel_Loading_Popup';
+                        popup.textContent = '잠시만 기다려 주십시오';
+                        document.body.appendChild(popup);
+                    }}
+                    setTimeout(function () {{ ask('5002', result[3]); }}, 100);
+                    return;
+                }}
+                if (popup) {{ popup.parentNode.removeChild(popup); }}
+                NetFunnel.gLastData.key = result[3];
+                document.getElementById('netfunnelKey').value = result[3];
+                form.submit();
+            }});
+    }}
+    ask('5101');
+}});
+</script>"""
+
+# 결과 페이지가 뜬 뒤 페이지 스크립트가 키 사용 완료를 알린다 (selenium-wire 키 캡쳐 대상)
+NETFUNNEL_COMPLETE = "<script>fetch('/ts.wseq?opcode=5004&key={key}&nfid=0');</script>"
+
+NETFUNNEL_RESULT = "NetFunnel.gControl.result='{opcode}:{status}:key={key}&nwait={nwait}&nfid=0'; NetFunnel.gControl._showResult();"
+
+SEAT_CELL = {
+    "예약하기": '<a href="/hpg/hra/02/confirmReservationInfo.do?train={train}&cls={cls}&psg={party}" class="btn_burgundy_dark"><span>예약하기</span></a>',
+    "좌석부족": '<a href="#" class="btn_large btn_burgundy_dark val_m wx90"><span>좌석부족</span></a>',
+    "신청하기": '<a href="/hpg/hra/02/requestReservationInfo.do?train={train}" class="btn_large"><span>신청하기</span></a>',
+}
+
+
+class MockSRT:
+    """
+    대역 서버의 상태. 조회/예약 시각을 기록해 벤치마크에서 사이클 시간을 계산한다.
+
+    :param trains: 열차 번호 목록
+    :param open_train: 좌석이 열릴 열차 번호
+    :param open_cls: 좌석이 열릴 등급 (special, standard, reserve)
+    :param open_at: 첫 조회 후 좌석이 열리기까지의 초
+    :param open_for: 좌석이 열려있는 초 (0이면 예약될 때까지)
+    :param seats: 열린 좌석 수 (조회 인원이 이보다 많으면 좌석부족)
+    :param netfunnel_every: N번째 NetFunnel 키 발급마다 대기열에 세움 (0이면 항상 바로 통과)
+    :param netfunnel_ms: 대기열에서 기다리는 시간
+    """
+
+    def __init__(self, trains=("301", "303", "305", "307", "309"), open_train="303", open_cls="standard",
+                 open_at=10.0, open_for=0.0, seats=1, netfunnel_every=0, netfunnel_ms=500, first_hour=8):
+        self.trains = list(trains)
+        self.open_train = open_train
+        self.open_cls = open_cls
+        self.open_at = open_at
+        self.open_for = open_for
+        self.seats = seats
+        self.netfunnel_every = netfunnel_every
+        self.netfunnel_ms = netfunnel_ms
+        self.first_hour = first_hour
+
+        self.lock = threading.Lock()
+        self.search_times = []  # 결과 테이블을 돌려준 시각
+        self.first_seen = None  # 열린 좌석을 처음 보여준 시각
+        self.booked_times = []  # 예약 성공 시각
+        self.failed_bookings = 0
+        self.bytes_sent = 0
+        self.keys = {}  # NetFunnel 키: 통과 시각 (조회에 쓰면 지움)
+        self.keys_issued = 0
+        self.queued = 0  # 대기열에 세운 횟수
+        self.rejected_searches = 0  # 통과한 키 없이 온 조회
+
+    def reset(self):
+        with self.lock:
+            self.search_times = []
+            self.first_seen = None
+            self.booked_times = []
+            self.failed_bookings = 0
+            self.bytes_sent = 0
+            self.queued = 0
+            self.rejected_searches = 0
+
+    def netfunnel(self, query):
+        """ts.wseq 응답. 5101: 키 발급, 5002: 대기 확인, 5004: 사용 완료"""
+        opcode = query.get("opcode", [""])[0]
+        key = query.get("key", [""])[0]
+        now = time.monotonic()
+        with self.lock:
+            if opcode == "5101":
+                self.keys_issued += 1
+                key = f"MOCKKEY{self.keys_issued}"
+                wait = self.netfunnel_every and self.keys_issued % self.netfunnel_every == 0
+                if wait:
+                    self.queued += 1
+                self.keys[key] = now + (self.netfunnel_ms / 1000 if wait else 0)
+            elif opcode == "5004":
+                self.keys.pop(key, None)
+            passed = key in self.keys and now >= self.keys[key]
+        nwait = 0 if passed else 10
+        return NETFUNNEL_RESULT.format(opcode=opcode, status="200" if passed else "201", key=key, nwait=nwait)
+
+    def use_key(self, key):
+        """조회 요청에 실린 키가 대기열을 통과한 키인지. 한 번 쓰면 다시 쓸 수 없다"""
+        now = time.monotonic()
+        with self.lock:
+            ready = self.keys.get(key)
+            if ready is None or now < ready:
+                self.rejected_searches += 1
+                return False
+            del self.keys[key]
+            return True
+
+    def seat_open(self, now):
+        if not self.search_times or self.seats <= 0:
+            return False
+        elapsed = now - self.search_times[0]
+        if elapsed < self.open_at:
+            return False
+        return not self.open_for or elapsed < self.open_at + self.open_for
+
+    def seat_state(self, train, cls, now, party=1):
+        if train == self.open_train and cls == self.open_cls and self.seat_open(now):
+            if cls == "reserve":
+                return "신청하기"
+            return "좌석부족" if party > self.seats else "예약하기"
+        return "매진"
+
+    def result_table(self, dt, now, party=1):
+        rows = []
+        base = datetime.strptime(dt + str(self.first_hour).zfill(2), "%Y%m%d%H")
+        for i, train in enumerate(self.trains):
+            dpt = base + timedelta(minutes=20 * i)
+            arr = dpt + timedelta(minutes=95)
+            cells = []
+            for cls in ("special", "standard", "reserve"):
+                state = self.seat_state(train, cls, now, party)
+                cells.append(SEAT_CELL.get(state, "<span>{state}</span>").format(train=train, cls=cls, state=state,
+                                                                                 party=party))
+            rows.append(
+                f'<tr><td>{i + 1}</td><td>SRT</td><td>{train}</td>'
+                f'<td><div class="val_m wx90">동탄</div><em class="time">{dpt:%H:%M}</em></td>'
+                f'<td><div class="val_m wx90">동대구</div><em class="time">{arr:%H:%M}</em></td>'
+                f'<td>{cells[0]}</td><td>{cells[1]}</td><td>{cells[2]}</td><td>-</td></tr>')
+        return ('<form id="result-form"><fieldset><div class="tbl_wrap th_thead"><table>'
+                '<thead><tr><th>구분</th><th>열차종류</th><th>열차번호</th><th>출발역</th><th>도착역</th>'
+                '<th>특실</th><th>일반실</th><th>예약대기</th><th>소요시간</th></tr></thead>'
+                f'<tbody>{"".join(rows)}</tbody></table></div></fieldset></form>')
+
+    def search_page(self, query):
+        now = time.monotonic()
+        dt = query.get("dptDt", [""])[0]
+        today = datetime.now()
+        dates = "".join(f'<option value="{today + timedelta(days=d):%Y%m%d}">{today + timedelta(days=d):%Y%m%d}</option>'
+                        for d in range(31))
+        times = "".join(f'<option value="{h:02d}0000">{h:02d}</option>' for h in range(0, 24, 2))
+        counts = "".join(f'<option value="{n}">{n}</option>' for n in range(10))
+        body = SEARCH_FORM.format(dpt=query.get("dptRsStnCdNm", [""])[0], arr=query.get("arvRsStnCdNm", [""])[0],
+                                  dates=dates, times=times, counts=counts)
+        key = query.get("netfunnelKey", [""])[0]
+        if dt and not self.use_key(key):
+            # 대기열을 거치지 않은 조회는 결과 없이 조회 페이지만
+            return body
+        if dt:
+            with self.lock:
+                self.search_times.append(now)
+                if self.first_seen is None and self.seat_open(now):
+                    self.first_seen = now
+                table = self.result_table(dt, now, party_size(query))
+            body += NETFUNNEL_COMPLETE.format(key=key) + table
+        return body
+
+    def confirm_page(self, query):
+        train = query.get("train", [""])[0]
+        cls = query.get("cls", [""])[0]
+        party = int(query.get("psg", ["1"])[0])
+        now = time.monotonic()
+        with self.lock:
+            if self.seat_state(train, cls, now, party) != "예약하기":
+                self.failed_bookings += 1
+                return '<div class="alert">잔여석없음</div>'
+            self.seats -= party
+            self.booked_times.append(now)
+        return ('<input type="hidden" id="isFalseGotoMain" value="Y">'
+                '<form id="list-form"><fieldset><h3>예약 확인</h3>'
+                '<div class="tbl_wrap th_thead"><table><tbody><tr><td>1</td><td>SRT</td>'
+                f'<td>{train}</td><td>동탄</td><td>동대구</td><td>08:20</td><td>09:55</td></tr></tbody></table></div>'
+                '<p></p><p></p><p></p>'
+                '<div><table><tbody><tr><td>일반실</td><td>어른 1</td><td>5호차 3A</td></tr></tbody></table></div>'
+                '</fieldset></form>')
+
+
+def party_size(query):
+    """조회 폼의 인원 select 합계 (없으면 1명)"""
+    total = sum(int(query.get(name, ["0"])[0] or 0) for name in ("psgInfoPerPrnb1", "psgInfoPerPrnb4", "psgInfoPerPrnb5"))
+    return total or 1
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_page(self, body, status=200, headers=()):
+            data = PAGE.format(body=body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+            with state.lock:
+                state.bytes_sent += len(data)
+
+        def send_script(self, text):
+            data = text.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/javascript; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def send_static(self, path):
+            content_type, data = STATIC[path]
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", "max-age=3600")
+            self.end_headers()
+            self.wfile.write(data)
+            with state.lock:
+                state.bytes_sent += len(data)
+
+        def redirect(self, location, headers=()):
+            self.send_response(302)
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+
+        def logged_in(self):
+            return SESSION_COOKIE in (self.headers.get("Cookie") or "")
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path == "/cmc/01/selectLoginForm.do":
+                self.send_page(LOGIN_FORM)
+            elif url.path == "/main.do":
+                self.send_page('<span class="my-name">홍길동님 환영합니다</span>' if self.logged_in() else LOGIN_FORM)
+            elif url.path == "/hpg/hra/01/selectScheduleList.do":
+                if not self.logged_in():
+                    self.redirect("/cmc/01/selectLoginForm.do")
+                else:
+                    self.send_page('<span class="my-name">홍길동님 환영합니다</span>' + state.search_page(query))
+            elif url.path == "/hpg/hra/02/confirmReservationInfo.do":
+                self.send_page(state.confirm_page(query))
+            elif url.path in STATIC:
+                self.send_static(url.path)
+            elif url.path == "/ts.wseq":
+                self.send_script(state.netfunnel(query))
+            else:
+                self.send_page("Not Found", status=404)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            if urlparse(self.path).path == "/cmc/01/selectLoginInfo.do":
+                self.redirect("/main.do", headers=[("Set-Cookie", SESSION_COOKIE + "; Path=/")])
+            else:
+                self.send_page("Not Found", status=404)
+
+    return Handler
+
+
+def serve(state, host="127.0.0.1", port=0):
+    """대역 서버를 백그라운드 스레드로 띄우고 (server, base_url) 반환"""
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local SRT stand-in server")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--open-train", type=str, default="303")
+    parser.add_argument("--open-cls", type=str, default="standard", choices=["special", "standard", "reserve"])
+    parser.add_argument("--open-at", type=float, default=10.0)
+    parser.add_argument("--open-for", type=float, default=0.0)
+    parser.add_argument("--seats", type=int, default=1)
+    parser.add_argument("--netfunnel-every", type=int, default=0)
+    parser.add_argument("--netfunnel-ms", type=int, default=500)
+    cli = parser.parse_args()
+
+    mock = MockSRT(open_train=cli.open_train, open_cls=cli.open_cls, open_at=cli.open_at, open_for=cli.open_for,
+                   seats=cli.seats, netfunnel_every=cli.netfunnel_every, netfunnel_ms=cli.netfunnel_ms)
+    httpd, url = serve(mock, port=cli.port)
+    print(f"SRT 대역 서버 실행 중: {url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        httpd.shutdown()
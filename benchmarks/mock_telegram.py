@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+로컬 텔레그램 봇 API 대역 서버
+
+sendMessage 요청을 받아 기록만 한다. fail_first 로 처음 N번은 502 를 돌려 재시도를 확인할 수 있다.
+
+    python benchmarks/mock_telegram.py --port 8081
+    python quickstart_telegram.py --notify --token test --chat_id 1 --telegram_url http://127.0.0.1:8081/bot ...
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class MockTelegram:
+    """
+    :param fail_first: 처음 N번의 요청을 실패시킨다
+    :param delay: 응답 전 지연 (초)
+    """
+
+    def __init__(self, fail_first=0, delay=0.0):
+        self.fail_first = fail_first
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.messages = []  # (chat_id, text)
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def send_json(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode("utf-8")
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                params = json.loads(body or "{}")
+            else:
+                params = {key: values[0] for key, values in parse_qs(body).items()}
+            time.sleep(state.delay)
+            with state.lock:
+                state.requests += 1
+                if state.requests <= state.fail_first:
+                    self.send_json(502, {"ok": False, "error_code": 502, "description": "Bad Gateway"})
+                    return
+                if not self.path.endswith("/sendMessage"):
+                    self.send_json(200, {"ok": True, "result": True})
+                    return
+                state.messages.append((params.get("chat_id"), params.get("text")))
+                message_id = len(state.messages)
+            self.send_json(200, {"ok": True, "result": {
+                "message_id": message_id,
+                "date": int(time.time()),
+                "chat": {"id": int(params.get("chat_id") or 0), "type": "private"},
+                "text": params.get("text"),
+            }})
+
+    return Handler
+
+
+def serve(state, host="127.0.0.1", port=0):
+    """대역 봇 서버를 백그라운드 스레드로 띄우고 (server, base_url) 반환. base_url 은 TelegramSink 에 그대로 넘긴다"""
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/bot"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Telegram Bot API stand-in")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--fail-first", type=int, default=0)
+    parser.add_argument("--delay", type=float, default=0.0)
+    cli = parser.parse_args()
+
+    bot = MockTelegram(fail_first=cli.fail_first, delay=cli.delay)
+    httpd, url = serve(bot, port=cli.port)
+    print(f"텔레그램 대역 서버 실행 중: {url}")
+    seen = 0
+    try:
+        while True:
+            time.sleep(0.5)
+            with bot.lock:
+                new = bot.messages[seen:]
+                seen = len(bot.messages)
+            for chat_id, text in new:
+                print(f"[{chat_id}] {text}")
+    except KeyboardInterrupt:
+        httpd.shutdown()
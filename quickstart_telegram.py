@@ -1,11 +1,17 @@
 """ Quickstart script for InstaPy usage """
 
 # imports
-from srt_reservation.main import SRT
-from srt_reservation.util import parse_cli_args
+import sys
+
+from srt_reservation.util import parse_cli_args, run_check
 
 if __name__ == "__main__":
     cli_args = parse_cli_args()
+    if cli_args.check:
+        sys.exit(run_check(cli_args))
+
+    # selenium 등은 실제로 실행할 때만 불러온다
+    from srt_reservation.main import SRT
 
     login_id = cli_args.user
     login_psw = cli_args.psw
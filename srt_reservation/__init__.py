@@ -1,2 +1,6 @@
-from .main import SRT
-
+def __getattr__(name):
+    # 설정 확인(--check)이나 이력/재생 CLI 처럼 브라우저가 필요 없는 경우 selenium 을 불러오지 않도록
+    if name == "SRT":
+        from .main import SRT
+        return SRT
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
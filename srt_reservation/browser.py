@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+# lean 모드에서 추가하는 크롬 옵션 (headless + 메모리 절약)
+# 백그라운드 타이머 스로틀링 해제는 CPU 를 더 쓰고, JS 힙 상한(--max-old-space-size)은 결과 페이지에서
+# 렌더러가 죽을 수 있어 넣지 않는다
+LEAN_ARGUMENTS = [
+    "headless=new",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-dev-shm-usage",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--mute-audio",
+    "--no-first-run",
+    "--renderer-process-limit=1",
+]
+
+# 이미지, 폰트, 미디어 차단 (2: 차단)
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+
+# CDP Network.setBlockedURLs 로 요청 자체를 막을 패턴
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*wcs.naver.net*", "*analytics*",
+]
+
+
+def apply_lean_options(options):
+    for argument in LEAN_ARGUMENTS:
+        options.add_argument(argument)
+    options.add_experimental_option("prefs", LEAN_PREFS)
+
+
+def enable_resource_blocking(driver, patterns=BLOCKED_URL_PATTERNS):
+    """
+    정적 리소스와 분석 스크립트 요청을 브라우저 단에서 차단한다.
+    캐시는 켜둔 채로 두어 재조회 시 CSS/JS 는 캐시에서 읽도록 한다.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
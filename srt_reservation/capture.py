@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+# selenium-wire 가 캡쳐할 URL 범위. NetFunnel 키 요청만 필요하므로 나머지 트래픽은 저장하지 않는다.
+NETFUNNEL_SCOPES = [r".*nf\.letskorail\.com.*", r".*opcode=5004.*"]
+
+
+def seleniumwire_options(max_size):
+    """
+    캡쳐 트래픽을 메모리에 최대 max_size 개까지만 보관하는 selenium-wire 옵션.
+    개수를 넘으면 가장 오래된 요청부터 버려지는 링 버퍼로 동작한다.
+    """
+    return {
+        "request_storage": "memory",
+        "request_storage_max_size": max_size,
+    }
+
+
+def find_netfunnel_key(driver):
+    """
+    캡쳐된 요청 중 가장 최근의 NetFunnel 키 요청(opcode=5004)을 찾는다.
+    범위와 버퍼 크기가 제한되어 있으므로 최신 요청부터 보면 보통 첫 항목에서 끝난다.
+
+    :return: (key, request), 없으면 (None, None)
+    """
+    for request in reversed(driver.requests):
+        url = request.url
+        if request.response and "opcode=5004" in url and "key=" in url and "&nfid" in url:
+            return url[url.index("key=") + 4:url.index("&nfid")], request
+    return None, None
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+
+class TelegramControl:
+    """
+    실행 중인 SRT 를 텔레그램 명령으로 조회/제어한다. 설정된 chat_id 의 메시지만 받는다.
+
+        /status  진행 상황
+        /stats   계측 요약
+        /pause   조회 일시정지
+        /resume  조회 재개
+        /stop    조회 종료
+
+    :param srt: 제어할 SRT 객체
+    :param token: 텔레그램 봇 token
+    :param chat_id: 명령을 받을 chat_id
+    :param base_url: 봇 API 주소 (로컬 대역 봇 사용 시 변경)
+    """
+
+    def __init__(self, srt, token, chat_id, base_url=None):
+        self.srt = srt
+        self.token = token
+        self.chat_id = chat_id
+        self.base_url = base_url
+        self.app = None
+
+    async def start(self):
+        from telegram.ext import ApplicationBuilder, CommandHandler, filters
+
+        builder = ApplicationBuilder().token(self.token)
+        if self.base_url:
+            builder = builder.base_url(self.base_url)
+        self.app = builder.build()
+        chat = filters.Chat(chat_id=self.chat_id)
+        for name, handler in (("status", self.status), ("stats", self.stats), ("pause", self.pause),
+                              ("resume", self.resume), ("stop", self.stop)):
+            self.app.add_handler(CommandHandler(name, handler, filters=chat))
+        await self.app.initialize()
+        await self.app.start()
+        await self.app.updater.start_polling(drop_pending_updates=True)
+        print("텔레그램 명령 수신 시작 (/status /stats /pause /resume /stop)")
+
+    async def close(self):
+        if self.app is None:
+            return
+        await self.app.updater.stop()
+        await self.app.stop()
+        await self.app.shutdown()
+        self.app = None
+
+    async def status(self, update, context):
+        await update.message.reply_text(self.srt.status_text())
+
+    async def stats(self, update, context):
+        await update.message.reply_text(self.srt.metrics.summary() or "기록 없음")
+
+    async def pause(self, update, context):
+        self.srt.paused = True
+        self.srt.wake()
+        await update.message.reply_text("조회 일시정지")
+
+    async def resume(self, update, context):
+        self.srt.paused = False
+        self.srt.wake()
+        await update.message.reply_text("조회 재개")
+
+    async def stop(self, update, context):
+        self.srt.stop_requested = True
+        self.srt.wake()
+        await update.message.reply_text("조회 종료 요청")
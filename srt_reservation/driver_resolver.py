@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+from srt_reservation.exceptions import DriverNotFoundError
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "srt_macro", "chromedriver.json")
+
+_CHROME_COMMANDS = {
+    "darwin": ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"],
+    "linux": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"],
+}
+
+
+def chromedriver_name():
+    return "chromedriver.exe" if sys.platform.startswith("win") else "chromedriver"
+
+
+def _version_of(command):
+    try:
+        out = subprocess.run([command, "--version"], capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"(\d+)\.\d+\.\d+\.\d+", out)
+    return match.group(0) if match else None
+
+
+def installed_chrome_version():
+    """설치된 크롬 버전을 네트워크 없이 확인. 찾지 못하면 None"""
+    if sys.platform.startswith("win"):
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as key:
+                return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            return None
+    platform = "darwin" if sys.platform == "darwin" else "linux"
+    for command in _CHROME_COMMANDS[platform]:
+        version = _version_of(command)
+        if version:
+            return version
+    return None
+
+
+def _major(version):
+    return version.split(".")[0] if version else None
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cache(cache_path, path, version):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"path": path, "version": version}, f)
+
+
+def _matches(version, chrome_version):
+    # 크롬 버전을 알 수 없으면 버전 비교는 건너뛴다
+    return chrome_version is None or _major(version) == _major(chrome_version)
+
+
+def resolve_chromedriver(allow_network=False, cache_path=DEFAULT_CACHE_PATH):
+    """
+    크롬 버전에 맞는 chromedriver 경로를 찾는다.
+    캐시 -> PATH 순서로 로컬에서 먼저 찾고, allow_network 일 때만 webdriver_manager 로 내려받는다.
+
+    :param allow_network: 로컬에 맞는 드라이버가 없을 때 내려받기 허용 여부
+    :param cache_path: 경로와 버전을 저장할 캐시 파일
+    :return: chromedriver 실행 파일 경로
+    """
+    chrome_version = installed_chrome_version()
+
+    cache = _load_cache(cache_path)
+    if cache and os.path.isfile(cache.get("path", "")) and _matches(cache.get("version"), chrome_version):
+        return cache["path"]
+
+    on_path = shutil.which(chromedriver_name())
+    if on_path:
+        version = _version_of(on_path)
+        if version and _matches(version, chrome_version):
+            _save_cache(cache_path, on_path, version)
+            return on_path
+
+    if not allow_network:
+        raise DriverNotFoundError(f"크롬({chrome_version}) 에 맞는 chromedriver 가 없습니다. "
+                                  f"--driver_online 으로 한 번 내려받거나 --chromedriver 로 경로를 지정해주세요.")
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    installed = ChromeDriverManager().install()
+    # install() 이 드라이버 대신 같은 폴더의 다른 파일 경로를 줄 때가 있어 폴더 기준으로 찾는다
+    path = os.path.join(os.path.dirname(installed), chromedriver_name())
+    if not os.path.isfile(path):
+        path = installed
+    _save_cache(cache_path, path, _version_of(path) or chrome_version)
+    return path
@@ -10,3 +10,25 @@ class InvalidDateError(Exception):
 class InvalidTimeFormatError(Exception):
     pass
 
+
+class DriverNotFoundError(Exception):
+    pass
+
+class InvalidSeatClassError(Exception):
+    pass
+
+class InvalidPassengerError(Exception):
+    pass
+
+
+class LoggedOutError(Exception):
+    pass
+
+class StalledError(Exception):
+    pass
+
+class RestartLimitError(Exception):
+    pass
+
+class InvalidJobFileError(Exception):
+    pass
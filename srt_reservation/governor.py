@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+from collections import deque
+from statistics import median
+
+# 재활용 동작
+RECYCLE_TAB = "tab"  # 조회 페이지를 새 탭으로 다시 연다 (렌더러 DOM/JS 힙 정리)
+RECYCLE_BROWSER = "browser"  # 크롬을 새로 띄운다
+
+
+def _children():
+    """{ppid: [pid, ...]} (/proc 기준)"""
+    tree = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        tree.setdefault(ppid, []).append(int(entry))
+    return tree
+
+
+def _memory_mb(pid, page_mb):
+    """
+    프로세스 메모리 (MB). 크롬 프로세스끼리 공유하는 페이지를 나눠 세는 PSS 를 쓰고,
+    smaps_rollup 이 없는 커널에서는 RSS 로 대신한다 (공유 페이지가 중복으로 세어져 더 크게 나온다).
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * page_mb
+
+
+def process_tree_usage(pid):
+    """
+    pid 와 모든 자식 프로세스의 (메모리 PSS 합계 MB, 누적 CPU 시간 초). /proc 이 없으면 None.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    tree = _children()
+    ticks = os.sysconf("SC_CLK_TCK")
+    page_mb = os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    memory = cpu = 0.0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/stat") as f:
+                stat = f.read()
+            memory += _memory_mb(current, page_mb)
+        except OSError:
+            continue
+        fields = stat[stat.rindex(")") + 2:].split()
+        cpu += (int(fields[11]) + int(fields[12])) / ticks
+        stack += tree.get(current, [])
+    return memory, cpu
+
+
+class ResourceGovernor:
+    """
+    오래 돌리면 크롬 렌더러 메모리와 DOM 이 늘어나 사이클 지연이 같이 늘어난다.
+    사이클마다 지연을, sample_every 사이클마다 크롬 프로세스 트리의 메모리(PSS)/CPU 를 재서
+    기준을 넘으면 사이클 사이에 탭이나 브라우저를 재활용하도록 알려준다.
+    브라우저를 새로 띄웠는데도 메모리가 상한 아래로 내려가지 않으면 (상한이 너무 낮음)
+    다음 브라우저 재시작까지 기다리는 사이클 수를 2배씩 늘린다 (max_backoff 배까지).
+
+    :param max_rss_mb: 크롬 프로세스 트리 메모리(PSS) 상한 (MB). 넘으면 브라우저 재시작 (0: 사용 안 함)
+    :param max_cpu: 최근 측정 구간의 CPU 사용률 상한 (코어 1개 = 1.0). 넘으면 탭 재생성 (0: 사용 안 함)
+    :param latency_drift: 최근 사이클 지연 중앙값이 재활용 직후 기준의 몇 배를 넘으면 탭 재생성 (0: 사용 안 함)
+    :param recycle_every: 이 사이클 수마다 무조건 탭 재생성 (0: 사용 안 함)
+    :param window: 지연 중앙값을 계산할 사이클 수 (기준과 최근 구간 각각)
+    :param sample_every: RSS/CPU 측정 간격 (사이클)
+    :param max_backoff: 효과 없는 브라우저 재시작 후 기다리는 사이클 수의 상한 (sample_every 의 배수)
+    :param metrics: Metrics (chrome_pss_mb, chrome_cpu_ratio 게이지와 recycles_<동작> 카운터 기록)
+    """
+
+    def __init__(self, max_rss_mb=0, max_cpu=0.0, latency_drift=2.0, recycle_every=0,
+                 window=20, sample_every=10, max_backoff=64, metrics=None):
+        self.max_rss_mb = max_rss_mb
+        self.max_cpu = max_cpu
+        self.latency_drift = latency_drift
+        self.recycle_every = recycle_every
+        self.window = window
+        self.sample_every = sample_every
+        self.max_backoff = max_backoff
+        self.metrics = metrics
+        self.pid = None
+        self.last_usage = None  # (측정 시각, 메모리 MB, 누적 CPU 초)
+        self.rss_mb = 0.0
+        self.cpu_ratio = 0.0
+        self.verify_recycle = False  # 브라우저 재시작 후 첫 측정에서 메모리가 내려갔는지 확인
+        self.ineffective_recycles = 0  # 연속으로 효과 없던 브라우저 재시작 수
+        self.browser_wait = 0  # 다음 브라우저 재시작까지 남은 사이클
+        self.reset()
+
+    def attach(self, pid):
+        """측정할 프로세스 (chromedriver 서비스 pid, 크롬은 그 자식) 를 지정. 브라우저를 새로 띄울 때마다 호출"""
+        self.pid = pid
+        self.last_usage = None
+        self.reset()
+
+    def reset(self):
+        """재활용 직후 호출. 지연 기준을 다시 잡는다"""
+        self.cycles = 0
+        self.baseline = []
+        self.recent = deque(maxlen=self.window)
+
+    def sample(self):
+        usage = process_tree_usage(self.pid) if self.pid is not None else None
+        if usage is None:
+            return
+        now = time.monotonic()
+        rss, cpu = usage
+        if self.last_usage is not None and now > self.last_usage[0]:
+            self.cpu_ratio = max(0.0, cpu - self.last_usage[2]) / (now - self.last_usage[0])
+        self.last_usage = (now, rss, cpu)
+        self.rss_mb = rss
+        if self.metrics is not None:
+            self.metrics.set("chrome_pss_mb", round(rss, 1))
+            self.metrics.set("chrome_cpu_ratio", round(self.cpu_ratio, 3))
+        if self.verify_recycle:
+            self.verify_recycle = False
+            if self.max_rss_mb and rss > self.max_rss_mb:
+                self.ineffective_recycles += 1
+                self.browser_wait = self.sample_every * min(self.max_backoff, 2 ** self.ineffective_recycles)
+                if self.metrics is not None:
+                    self.metrics.inc("recycles_ineffective")
+                print(f"크롬을 새로 띄워도 메모리 {rss:.0f}MB 로 상한 {self.max_rss_mb}MB 보다 큼. "
+                      f"{self.browser_wait} 사이클 동안 재시작하지 않습니다")
+            else:
+                self.ineffective_recycles = 0
+
+    def observe(self, latency):
+        """
+        사이클 하나가 끝날 때 호출.
+
+        :param latency: 이번 사이클의 조회 + 결과 확인 시간 (초)
+        :return: 지금 할 재활용 동작 (RECYCLE_TAB, RECYCLE_BROWSER) 또는 None
+        """
+        self.cycles += 1
+        if self.browser_wait:
+            self.browser_wait -= 1
+        if len(self.baseline) < self.window:
+            self.baseline.append(latency)
+        else:
+            self.recent.append(latency)
+        if self.cycles % self.sample_every == 0:
+            self.sample()
+
+        action = None
+        if self.max_rss_mb and self.rss_mb > self.max_rss_mb and not self.browser_wait:
+            action = RECYCLE_BROWSER
+        elif self.max_cpu and self.cpu_ratio > self.max_cpu:
+            action = RECYCLE_TAB
+        elif (self.latency_drift and len(self.recent) == self.window
+              and median(self.recent) > median(self.baseline) * self.latency_drift):
+            action = RECYCLE_TAB
+        elif self.recycle_every and self.cycles >= self.recycle_every:
+            action = RECYCLE_TAB
+        if action is not None:
+            if self.metrics is not None:
+                self.metrics.inc(f"recycles_{action}")
+            # 재활용 후 값이 내려갈 때까지 같은 기준으로 다시 걸리지 않도록
+            self.rss_mb = 0.0
+            self.cpu_ratio = 0.0
+            self.last_usage = None
+            self.verify_recycle = action == RECYCLE_BROWSER
+            self.reset()
+        return action
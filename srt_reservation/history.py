@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+좌석 상태 이력 저장소와 조회 CLI
+
+조회할 때마다 열차별 좌석 상태를 SQLite(WAL) 파일에 남긴다. 바뀐 상태만 기록하므로
+며칠을 돌려도 파일이 작다. 조회는 mmap 으로 읽는다.
+
+    python -m srt_reservation.history --db history.db changes --dpt 동탄 --arr 동대구 --dt 20220117
+    python -m srt_reservation.history --db history.db lifetimes --dpt 동탄 --arr 동대구
+    python -m srt_reservation.history --db history.db hourly --dpt 동탄 --arr 동대구
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from srt_reservation.exceptions import InvalidStationNameError
+from srt_reservation.stations import lookup
+
+# 좌석 상태 코드 (열 하나에 작은 정수로 저장)
+SOLD_OUT, AVAILABLE, SHORT, WAITLIST, OTHER = range(5)
+STATE_NAME = {SOLD_OUT: "매진", AVAILABLE: "예약하기", SHORT: "좌석부족", WAITLIST: "신청하기", OTHER: "-"}
+SEAT_CLASSES = ("special", "standard", "reserve")
+CLASS_NAME = {"special": "특실", "standard": "일반실", "reserve": "예약대기"}
+
+MMAP_SIZE = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trains (
+    id INTEGER PRIMARY KEY,
+    dpt TEXT NOT NULL,
+    arr TEXT NOT NULL,
+    dt TEXT NOT NULL,
+    train_no TEXT NOT NULL,
+    dpt_tm TEXT NOT NULL,
+    arr_tm TEXT NOT NULL,
+    UNIQUE (dpt, arr, dt, train_no)
+);
+CREATE TABLE IF NOT EXISTS changes (
+    ts REAL NOT NULL,
+    train INTEGER NOT NULL REFERENCES trains (id),
+    special INTEGER NOT NULL,
+    standard INTEGER NOT NULL,
+    reserve INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS changes_train_ts ON changes (train, ts);
+"""
+
+
+def encode_state(text):
+    """결과 테이블 칸 문구를 상태 코드로"""
+    if "예약하기" in text:
+        return AVAILABLE
+    if "좌석부족" in text:
+        return SHORT
+    if "신청하기" in text:
+        return WAITLIST
+    if "매진" in text:
+        return SOLD_OUT
+    return OTHER
+
+
+def _fmt_ts(ts):
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class HistoryStore:
+    """
+    :param path: SQLite 파일 경로
+    :param readonly: 조회 전용으로 열지 여부
+    """
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        else:
+            # 조회 루프는 드라이버 전용 스레드에서 기록한다 (한 번에 한 스레드만 사용)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        self.train_ids = {}  # (dpt, arr, dt, train_no) -> id
+        self.last = {}  # id -> 마지막으로 기록한 (special, standard, reserve)
+        if not readonly:
+            self._load_last()
+
+    def _load_last(self):
+        for train_id, dpt, arr, dt, train_no in self.conn.execute("SELECT id, dpt, arr, dt, train_no FROM trains"):
+            self.train_ids[(dpt, arr, dt, train_no)] = train_id
+        query = ("SELECT c.train, c.special, c.standard, c.reserve FROM changes c "
+                 "JOIN (SELECT train, MAX(ts) AS ts FROM changes GROUP BY train) m ON c.train = m.train AND c.ts = m.ts")
+        for train_id, special, standard, reserve in self.conn.execute(query):
+            self.last[train_id] = (special, standard, reserve)
+
+    def _train_id(self, dpt, arr, dt, row):
+        key = (dpt, arr, dt, row.train_no)
+        train_id = self.train_ids.get(key)
+        if train_id is None:
+            self.conn.execute("INSERT OR IGNORE INTO trains (dpt, arr, dt, train_no, dpt_tm, arr_tm) VALUES (?, ?, ?, ?, ?, ?)",
+                              (dpt, arr, dt, row.train_no, row.dpt_tm, row.arr_tm))
+            train_id = self.conn.execute("SELECT id FROM trains WHERE dpt = ? AND arr = ? AND dt = ? AND train_no = ?",
+                                         key).fetchone()[0]
+            self.train_ids[key] = train_id
+        return train_id
+
+    def record(self, dpt, arr, dt, rows, ts=None):
+        """
+        조회 결과 스냅샷을 기록. 직전 기록과 상태가 같은 열차는 건너뛴다.
+
+        :param rows: TrainRow 목록
+        :return: 기록한 변경 수
+        """
+        ts = time.time() if ts is None else ts
+        changed = []
+        for row in rows:
+            train_id = self._train_id(dpt, arr, dt, row)
+            states = tuple(encode_state(getattr(row, seat_class)) for seat_class in SEAT_CLASSES)
+            if self.last.get(train_id) != states:
+                self.last[train_id] = states
+                changed.append((ts, train_id) + states)
+        if changed:
+            self.conn.executemany("INSERT INTO changes (ts, train, special, standard, reserve) VALUES (?, ?, ?, ?, ?)",
+                                  changed)
+        self.conn.commit()
+        return len(changed)
+
+    def _events(self, dpt, arr, dt=None):
+        """(ts, dt, train_no, dpt_tm, special, standard, reserve) 를 열차, 시각 순으로"""
+        query = ("SELECT c.ts, t.dt, t.train_no, t.dpt_tm, c.special, c.standard, c.reserve "
+                 "FROM changes c JOIN trains t ON c.train = t.id WHERE t.dpt = ? AND t.arr = ?")
+        params = [dpt, arr]
+        if dt is not None:
+            query += " AND t.dt = ?"
+            params.append(dt)
+        return self.conn.execute(query + " ORDER BY t.id, c.ts", params)
+
+    def changes(self, dpt, arr, dt=None):
+        """상태가 바뀐 시점 목록"""
+        return list(self._events(dpt, arr, dt))
+
+    def lifetimes(self, dpt, arr, dt=None, seat_class="standard"):
+        """
+        좌석이 풀려서(예약하기) 다시 사라질 때까지 걸린 시간 목록.
+
+        :return: [(풀린 시각, 날짜, 열차번호, 유지 시간(초))], 아직 남아 있는 좌석은 제외
+        """
+        column = 4 + SEAT_CLASSES.index(seat_class)
+        result = []
+        opened = {}
+        for event in self._events(dpt, arr, dt):
+            key = (event[1], event[2])
+            available = event[column] == AVAILABLE
+            if available and key not in opened:
+                opened[key] = event[0]
+            elif not available and key in opened:
+                started = opened.pop(key)
+                result.append((started, event[1], event[2], event[0] - started))
+        return result
+
+    def hourly(self, dpt, arr, dt=None, seat_class="standard"):
+        """좌석이 풀린 횟수를 시(0~23)별로 센다"""
+        column = 4 + SEAT_CLASSES.index(seat_class)
+        counts = [0] * 24
+        previous = {}
+        for event in self._events(dpt, arr, dt):
+            key = (event[1], event[2])
+            available = event[column] == AVAILABLE
+            if available and not previous.get(key, False):
+                counts[datetime.fromtimestamp(event[0]).hour] += 1
+            previous[key] = available
+        return counts
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query SRT seat availability history")
+    parser.add_argument("--db", help="History SQLite file", type=str, required=True, metavar="history.db")
+    parser.add_argument("command", choices=("changes", "lifetimes", "hourly"))
+    parser.add_argument("--dpt", help="Departure station", type=str, required=True, metavar="dpt")
+    parser.add_argument("--arr", help="Arrival station", type=str, required=True, metavar="arr")
+    parser.add_argument("--dt", help="Departure date (all dates if omitted)", type=str, metavar="yyyymmdd")
+    parser.add_argument("--seat_class", help="Seat class for lifetimes/hourly", choices=SEAT_CLASSES, default="standard")
+    args = parser.parse_args(argv)
+    # 이력은 조회 폼의 역 이름으로 저장되므로 별칭(ex. 김천 -> 김천(구미))도 SearchJob 과 같이 바꿔서 찾는다
+    try:
+        args.dpt = lookup(args.dpt, "출발역").name
+        args.arr = lookup(args.arr, "도착역").name
+    except InvalidStationNameError as e:
+        print(f"오류: {e}")
+        return 1
+
+    store = HistoryStore(args.db, readonly=True)
+    try:
+        if args.command == "changes":
+            for ts, dt, train_no, dpt_tm, *states in store.changes(args.dpt, args.arr, args.dt):
+                classes = ", ".join(f"{CLASS_NAME[name]} {STATE_NAME[state]}" for name, state in zip(SEAT_CLASSES, states))
+                print(f"{_fmt_ts(ts)}  {dt} {train_no:>5} {dpt_tm}  {classes}")
+        elif args.command == "lifetimes":
+            lifetimes = store.lifetimes(args.dpt, args.arr, args.dt, args.seat_class)
+            for started, dt, train_no, seconds in lifetimes:
+                print(f"{_fmt_ts(started)}  {dt} {train_no:>5}  {seconds:.1f}초")
+            if lifetimes:
+                seconds = sorted(item[3] for item in lifetimes)
+                print(f"{len(seconds)}건, 중앙값 {seconds[len(seconds) // 2]:.1f}초, 최대 {seconds[-1]:.1f}초")
+        else:
+            counts = store.hourly(args.dpt, args.arr, args.dt, args.seat_class)
+            peak = max(counts) or 1
+            for hour, count in enumerate(counts):
+                print(f"{hour:02d}시 {count:5d} {'#' * round(count * 40 / peak)}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+여러 조회 조건(job)을 브라우저 하나, 로그인 한 번으로 번갈아 조회한다 (--jobs)
+
+job 파일은 JSON 목록이고, 항목마다 명령행 인자 이름으로 조회 조건을 덮어쓴다.
+항목에 없는 값은 명령행 인자를 그대로 쓴다. trains, classes 는 목록으로 써도 된다.
+
+    [
+        {"name": "동탄 출발", "dpt": "동탄", "arr": "부산", "dt": "20220301", "tm": "08"},
+        {"name": "수서 출발", "dpt": "수서", "arr": "부산", "dt": "20220301", "tm": "08", "adults": 2}
+    ]
+"""
+import argparse
+import json
+from datetime import datetime
+
+from srt_reservation.exceptions import InvalidDateError, InvalidDateFormatError, InvalidJobFileError
+from srt_reservation.passengers import Passengers
+from srt_reservation.policy import SelectionPolicy
+from srt_reservation.stations import check_route, lookup
+from srt_reservation.util import build_parser
+
+# job 마다 바꿀 수 있는 인자. 로그인, 알림, 조회 빈도 등은 세션 전체에 하나씩이다
+JOB_KEYS = ("name", "dpt", "arr", "dt", "tm", "num", "reserve", "special", "any", "senior", "child",
+            "latest", "arrive_by", "trains", "classes", "quantity", "adults", "seniors", "children", "partial", "car")
+
+
+def load_job_args(path, args):
+    """
+    job 파일을 읽어 job 마다 명령행 인자를 덮어쓴 인자 목록을 만든다.
+
+    :param path: job 파일 경로
+    :param args: 명령행 인자 (기본값)
+    :return: [argparse.Namespace], 각각 name 이 채워져 있다
+    :raise InvalidJobFileError: 파일을 읽을 수 없거나 형식이 잘못되었을 때
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError) as e:
+        raise InvalidJobFileError(f"job 파일 오류. {path} 을/를 읽을 수 없습니다. ({e})")
+    if not isinstance(entries, list) or not entries:
+        raise InvalidJobFileError(f"job 파일 오류. {path} 은/는 조회 조건 목록이어야 합니다.")
+
+    jobs = []
+    for i, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            raise InvalidJobFileError(f"job 파일 오류. {i}번째 항목이 객체가 아닙니다.")
+        unknown = sorted(set(entry) - set(JOB_KEYS))
+        if unknown:
+            raise InvalidJobFileError(f"job 파일 오류. {i}번째 항목의 알 수 없는 키: {', '.join(unknown)}")
+        values = dict(vars(args), name=None)
+        for key, value in entry.items():
+            values[key] = _convert(i, key, value)
+        job_args = argparse.Namespace(**values)
+        if not job_args.name:
+            job_args.name = f"{job_args.dpt}->{job_args.arr} {job_args.dt} {job_args.tm}시"
+        jobs.append(job_args)
+    return jobs
+
+
+def _convert(i, key, value):
+    """job 항목 값을 명령행 인자와 같은 type 으로 바꾼다 (ex. "num": "3" -> 3)"""
+    if key == "name":
+        return None if value is None else str(value)
+    action = _ACTIONS[key]
+    if isinstance(value, list):
+        value = ",".join(map(str, value))
+    if value is None:
+        return None
+    if action.type is None:
+        # --reserve 같은 켜고 끄는 옵션
+        if not isinstance(value, bool):
+            raise InvalidJobFileError(f"job 파일 오류. {i}번째 항목의 {key} 은/는 true 나 false 여야 합니다. ({value!r})")
+        return value
+    # 3.5 -> "3.5" 처럼 문자열을 거치면 int 변환에서 걸러진다
+    if not isinstance(value, (bool, dict)):
+        try:
+            return action.type(str(value))
+        except ValueError:
+            pass
+    raise InvalidJobFileError(f"job 파일 오류. {i}번째 항목의 {key} 값의 형식이 잘못되었습니다. ({value!r})")
+
+
+# job 키별 명령행 인자 정의 (type 변환용)
+_ACTIONS = {action.dest: action for action in build_parser()._actions if action.dest in JOB_KEYS}
+
+
+class SearchJob:
+    """
+    조회 조건 하나와 그 조건의 예약 진행 상황. 목표 수량을 다 예약하면 그 job 만 조회에서 빠진다.
+
+    :param args: 명령행 인자 (job 파일로 만든 경우 항목 값이 덮어쓴 것)
+    """
+
+    def __init__(self, args):
+        self.dpt_stn = args.dpt
+        self.arr_stn = args.arr
+        self.dpt_dt = str(args.dt)
+        self.dpt_tm = str(int(args.tm) // 2 * 2).zfill(2)
+        self.real_dpt_tm = args.tm
+
+        self.want_senior = args.senior
+        self.want_child = args.child
+        self.num_trains_to_check = args.num
+        self.want_reserve = args.reserve
+        self.want_special = args.special
+        self.want_any = args.any
+
+        self.check_input()
+        self.name = getattr(args, "name", None) or f"{self.dpt_stn}->{self.arr_stn} {self.dpt_dt} {self.real_dpt_tm}시"
+        self.policy = SelectionPolicy.from_args(args)
+        self.passengers = Passengers.from_args(args)
+        self.passengers_left = self.passengers  # 아직 예약하지 못한 승객
+        self.party = self.passengers  # 이번 조회/예약에 쓰는 승객 구성
+        self.allow_partial = args.partial
+        self.form_dirty = False  # 조회 폼의 승객 구성을 다시 입력해야 하는지
+        self.http_form = None  # HTTP 조회에 쓸 이 job 의 조회 폼 값 (브라우저에서 한 번 채워 가져온 것)
+        self.quantity = self.passengers.total
+        self.cnt_quantity = 0
+        self.cnt_refresh = 0  # 이 job 의 조회 횟수
+        self.is_booked = False
+
+    def check_input(self):
+        # 별칭(ex. 김천 -> 김천(구미))은 조회 폼의 역 이름으로 바꾼다
+        self.dpt_station = lookup(self.dpt_stn, "출발역")
+        self.arr_station = lookup(self.arr_stn, "도착역")
+        check_route(self.dpt_station, self.arr_station)
+        self.dpt_stn = self.dpt_station.name
+        self.arr_stn = self.arr_station.name
+        if not str(self.dpt_dt).isnumeric():
+            raise InvalidDateFormatError("날짜는 숫자로만 이루어져야 합니다.")
+        try:
+            datetime.strptime(str(self.dpt_dt), '%Y%m%d')
+        except ValueError:
+            raise InvalidDateError("날짜가 잘못 되었습니다. YYYYMMDD 형식으로 입력해주세요.")
+
+    def config_text(self):
+        return (f'출발역:{self.dpt_stn} , 도착역:{self.arr_stn}\n'
+                f'날짜:{self.dpt_dt}, 시간: {self.real_dpt_tm}시 이후\n'
+                f'{self.num_trains_to_check}개의 기차 중 예약\n'
+                f'예약 대기 사용: {self.want_reserve}\n'
+                f'특실 여부: {self.want_special}\n'
+                f'무조건 여부: {self.want_any}\n'
+                f'승객: {self.party} (부분 예약: {self.allow_partial})')
+
+    def status_text(self):
+        return (f'{self.dpt_stn} -> {self.arr_stn} {self.dpt_dt} {self.real_dpt_tm}시 이후\n'
+                f'새로고침 {self.cnt_refresh}회, 예약 {self.cnt_quantity}/{self.quantity}')
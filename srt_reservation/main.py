@@ -1,31 +1,34 @@
 # -*- coding: utf-8 -*-
-import os
 import time
 
-from seleniumwire.undetected_chromedriver import ChromeOptions
-from telegram import Bot
-from telegram.constants import ParseMode
-from telegram.error import TimedOut
-from telegram.request import HTTPXRequest
-from telegram.ext import ApplicationBuilder
-import requests
 import asyncio
-import json
-from random import randint, random
-from datetime import datetime
-from seleniumwire import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
+from concurrent.futures import ThreadPoolExecutor
+from random import random
+from urllib.parse import urlparse
+# seleniumwire(mitmproxy), requests, telegram, cryptography, sqlite3 등 무거운 모듈은 쓰는 기능이 켜졌을 때만
+# 해당 지점에서 불러온다 (python -X importtime 으로 확인)
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.select import Select
-from selenium.common.exceptions import ElementClickInterceptedException, StaleElementReferenceException, WebDriverException, TimeoutException, NoSuchElementException
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException
 from selenium.webdriver.support import expected_conditions as EC
 
-from srt_reservation.exceptions import InvalidStationNameError, InvalidDateError, InvalidDateFormatError, InvalidTimeFormatError
-from srt_reservation.validation import station_list
+from srt_reservation.exceptions import LoggedOutError, StalledError
+from srt_reservation.jobs import SearchJob, load_job_args
+from srt_reservation.snapshot import (BOOKING_PENDING_JS, CLICK_SEAT_JS, FILL_FORM_JS, READ_RECEIPT_JS, RESULT_TBODY,
+                                      SEARCH_STATE_JS, SUBMIT_SEARCH_JS, CommandCounter, read_result_rows)
+from srt_reservation.parsing import Confirmation
+from srt_reservation.waits import Waiter
+from srt_reservation.policy import CLASS_COLUMN, CLASS_NAME
+from srt_reservation.scheduler import PollScheduler
+from srt_reservation.control import TelegramControl
+from srt_reservation.supervisor import Supervisor
+from srt_reservation.governor import RECYCLE_TAB, ResourceGovernor
+from srt_reservation.notifier import FileSink, Notifier, StdoutSink, TelegramSink
+from srt_reservation.metrics import Metrics
+from srt_reservation.browser import apply_lean_options, enable_resource_blocking
+from srt_reservation.driver_resolver import resolve_chromedriver
+from srt_reservation.capture import NETFUNNEL_SCOPES, find_netfunnel_key, seleniumwire_options
 
 class SRT:
     def __init__(self, args):
@@ -43,475 +46,790 @@ class SRT:
         :param want_special: 특실 선택 여부
         :param want_any: 특실, 일반실 상관없는 예약 여부
         :param want_senior: 경로 우대 여부
-        :param quantity: 총 예매할 기차표 수
+        :param quantity: 총 예매할 기차표 수 (승객 구성을 따로 주지 않으면 어른 quantity 명을 한 번에 예약)
+        :param adults: 어른 수
+        :param seniors: 경로 수
+        :param children: 어린이 수
+        :param partial: 인원만큼 좌석이 없으면 인원을 줄여 나눠서 예약할지 여부
+        :param latest: 이 시각까지 출발하는 열차만 HH:MM
+        :param arrive_by: 이 시각까지 도착하는 열차만 HH:MM
+        :param trains: 먼저 시도할 열차 번호 (쉼표로 구분)
+        :param classes: 좌석 등급 우선순위 (쉼표로 구분, special/standard). 주면 special, any 대신 사용
+        :param telegram_url: 텔레그램 봇 API 주소 (로컬 대역 봇 사용 시 변경)
+        :param control: 텔레그램 명령(/status /stats /pause /resume /stop)으로 제어할지 여부 (notify 필요)
+        :param notify_stdout: 알림을 표준 출력으로도 보낼지 여부
+        :param notify_file: 알림을 기록할 파일 경로
+        :param base_url: SRT 사이트 주소 (로컬 대역 서버 사용 시 변경)
+        :param headless: 크롬 headless 실행 여부
+        :param lean: headless + 이미지/폰트/미디어/분석 스크립트 차단 + 저메모리 옵션 사용 여부
+        :param session_cache: 로그인 쿠키를 암호화 저장해 재시작 시 로그인 생략 여부
+        :param chromedriver: chromedriver 경로 직접 지정
+        :param driver_online: 로컬에 맞는 chromedriver 가 없을 때 내려받기 허용 여부
+        :param capture_scope: selenium-wire 가 캡쳐할 URL 정규식 목록 (기본: NetFunnel 요청만)
+        :param capture_max: 메모리에 보관할 캡쳐 요청 최대 개수
+        :param max_rate: 분당 최대 조회 수
+        :param active: 조회 활성 시간대 목록 HH:MM-HH:MM (없으면 항상)
+        :param metrics_log: 사이클별 계측 JSON-lines 파일 경로
+        :param metrics_prom: Prometheus textfile 경로
+        :param history: 좌석 상태 변경 이력을 남길 SQLite 파일 경로
+        :param trace: 사이클별 페이지 HTML 과 판단을 기록할 gzip 파일 경로
+        :param trace_max: trace 파일을 돌릴 크기 (MB)
+        :param watchdog: 조회가 이 시간(초) 동안 진행되지 않으면 드라이버를 새로 띄운다
+        :param max_restarts: restart_window 초 안에 허용할 최대 복구 횟수
+        :param restart_window: 복구 횟수를 세는 구간 (초)
+        :param http_poll: 조회는 브라우저 쿠키로 HTTP 요청만 보내고, 좌석이 보일 때만 브라우저로 예약
+        :param max_rss: 크롬 프로세스 트리 메모리(PSS)가 이 값(MB)을 넘으면 사이클 사이에 크롬을 새로 띄운다 (0: 사용 안 함)
+        :param max_cpu: 크롬 CPU 사용률(코어 수)이 이 값을 넘으면 사이클 사이에 조회 탭을 새로 연다
+        :param latency_drift: 사이클 지연이 기준의 이 배수를 넘으면 사이클 사이에 조회 탭을 새로 연다
+        :param recycle_every: 이 사이클 수마다 조회 탭을 새로 연다
+        :param jobs: 여러 조회 조건을 번갈아 조회할 job 파일 (JSON). 주면 조회 조건 인자는 job 의 기본값이 된다
         """
         self.login_id = None
         self.login_psw = None
 
-        self.dpt_stn = args.dpt
-        self.arr_stn = args.arr
-        self.dpt_dt = args.dt
-        self.dpt_tm = str(int(args.tm) // 2 * 2).zfill(2)
-        self.dpt_tm_offset = 0
-        self.real_dpt_tm = args.tm
-        
-        self.want_senior = args.senior
-        self.want_child = args.child
-
-        self.num_trains_to_check = args.num
-        self.want_reserve = args.reserve
-        self.want_special = args.special
-        self.want_any = args.any
-        self.driver = None
+        # 조회 조건별 상태. 한 조회 주기마다 예약이 끝나지 않은 다음 job 으로 넘어간다
+        self.jobs = [SearchJob(job_args) for job_args in load_job_args(args.jobs, args)] if args.jobs else [SearchJob(args)]
+        self.job = self.jobs[0]
+        self.form_job = None  # 브라우저 조회 폼에 값이 들어가 있는 job
+        self.trace_job = None  # trace 에 마지막으로 설정을 기록한 job
 
-        self.is_booked = False  # 예약 완료 되었는지 확인용
+        self.driver = None
+        self.base_url = args.base_url.rstrip('/')
+        self.lean = args.lean
+        self.headless = args.headless or self.lean
+        self.session_cache = args.session_cache
+        self.session_store = None
+        self.login_backoff_max = 60
+        self.chromedriver = args.chromedriver
+        self.driver_online = args.driver_online
+        self.capture_scopes = args.capture_scope or NETFUNNEL_SCOPES
+        self.capture_max = args.capture_max
+
+        self.is_booked = False  # 모든 job 의 예약이 완료 되었는지 확인용
         self.cnt_refresh = 0  # 새로고침 회수 기록
+        self.last_progress = time.monotonic()  # watchdog 용 마지막 조회 시각
+        self.watchdog_timeout = args.watchdog
+        self.max_restarts = args.max_restarts
+        self.restart_window = args.restart_window
+        self.recovering_since = None  # 복구 시작 시각 (다음 조회 결과를 읽으면 복구 완료)
+        self.search_task = None
+        self.stalled = False
+        self.paused = False
+        self.stop_requested = False
+        self.wakeup = None  # 텔레그램 명령이 쉬고 있는 조회 루프를 깨우는 asyncio.Event
+        self.rest_until = None  # 조회 사이에 쉬는 중이면 다음 조회 시각 (monotonic)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="driver")
+        self.started_at = None  # 첫 조회까지 걸린 시간 측정용
+        self.driver_calls = None  # 조회 주기별 드라이버 호출 수 집계
+        self.waiter = None
+        self.metrics = Metrics(jsonl_path=args.metrics_log, prom_path=args.metrics_prom)
+        self.poller = None
+        if args.http_poll:
+            from srt_reservation.transport import HttpPoller
+            self.poller = HttpPoller()
+        self.polled = None  # HTTP 조회 결과 (행 목록, HTML)
+        self.governor = ResourceGovernor(max_rss_mb=args.max_rss, max_cpu=args.max_cpu,
+                                         latency_drift=args.latency_drift, recycle_every=args.recycle_every,
+                                         metrics=self.metrics)
+        self.scheduler = PollScheduler(max_rate=args.max_rate, windows=args.active, metrics=self.metrics)
 
-        self.check_input()
         self.notify = args.notify
         self.token = args.token
         self.chat_id = args.chat_id
 
-        # HTTPXRequest로 타임아웃 설정
-        request = HTTPXRequest(
-            connect_timeout=10,
-            read_timeout=20,
-        )
-        self.bot = Bot(token=self.token, request=request)
-        self.quantity = args.quantity
-        self.cnt_quantity = 0
+        sinks = []
+        if self.notify:
+            sinks.append(TelegramSink(self.token, self.chat_id, base_url=args.telegram_url))
+        if args.notify_stdout:
+            sinks.append(StdoutSink())
+        if args.notify_file:
+            sinks.append(FileSink(args.notify_file))
+        self.notifier = Notifier(sinks, metrics=self.metrics) if sinks else None
+        self.telegram_url = args.telegram_url
+        self.control = args.control and self.notify
+        self.history = None
+        if args.history:
+            from srt_reservation.history import HistoryStore
+            self.history = HistoryStore(args.history)
+        self.trace = None
+        if args.trace:
+            from srt_reservation.trace import TraceRecorder
+            self.trace = TraceRecorder(args.trace, max_bytes=args.trace_max * 1024 * 1024)
 
         self.NF_pass_flag = False
         self.key = ""
 
-    async def telegram_send(self, txt):
-        try:
-            await self.bot.send_message(chat_id=self.chat_id, text=txt)
-            print("Telegram 메세지 전송 성공")
-        except Exception as e:
-            print(f"Telegram 메세지 전송 실패: {e}")
-
-    def check_input(self):
-        if self.dpt_stn not in station_list:
-            raise InvalidStationNameError(f"출발역 오류. '{self.dpt_stn}' 은/는 목록에 없습니다.")
-        if self.arr_stn not in station_list:
-            raise InvalidStationNameError(f"도착역 오류. '{self.arr_stn}' 은/는 목록에 없습니다.")
-        if not str(self.dpt_dt).isnumeric():
-            raise InvalidDateFormatError("날짜는 숫자로만 이루어져야 합니다.")
-        try:
-            datetime.strptime(str(self.dpt_dt), '%Y%m%d')
-        except ValueError:
-            raise InvalidDateError("날짜가 잘못 되었습니다. YYYYMMDD 형식으로 입력해주세요.")
+    def send_notification(self, txt):
+        """알림 큐에 넣고 바로 돌아온다. 실제 전송은 백그라운드에서 한다"""
+        if self.notifier is not None:
+            self.notifier.notify(txt)
 
     def set_log_info(self, login_id, login_psw):
         self.login_id = login_id
         self.login_psw = login_psw
+        if self.session_cache:
+            from srt_reservation.session import SessionStore
+            self.session_store = SessionStore(login_id, login_psw)
 
     def run_driver(self):
-        try:
-            options = ChromeOptions()
-            # options.add_argument('headless')
-            options.add_argument("disable-gpu")
-            options.add_argument("--no-sandbox")
+        from seleniumwire import webdriver
+
+        options = ChromeOptions()
+        if self.lean:
+            apply_lean_options(options)
+        elif self.headless:
+            options.add_argument('headless')
+        options.add_argument("disable-gpu")
+        options.add_argument("--no-sandbox")
 
+        if not self.lean:
             options.set_capability(
                 "goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"}
             )
 
-            chrome_install = ChromeDriverManager().install()
-            folder = os.path.dirname(chrome_install)
-            chromedriver_path = os.path.join(folder, "chromedriver.exe")
-            service = ChromeService(chromedriver_path)
-            # service = ChromeService(executable_path=ChromeDriverManager().install())
-
-            # self.driver = webdriver.Chrome(options=options)
-            self.driver = webdriver.Chrome(service=service, options=options)
-            self.driver.set_window_size(1920, 1080)
-            # self.driver.set_window_position(-2560, 0) # dual QHD monitor setting
+        with self.metrics.phase("driver_resolve"):
+            chromedriver_path = self.chromedriver or resolve_chromedriver(allow_network=self.driver_online)
+        service = ChromeService(chromedriver_path)
+        # service = ChromeService(executable_path=ChromeDriverManager().install())
+
+        if urlparse(self.base_url).hostname in ("127.0.0.1", "localhost"):
+            # 로컬 대역 서버 트래픽도 selenium-wire 프록시를 거치도록
+            options.add_argument("--proxy-bypass-list=<-loopback>")
+
+        # self.driver = webdriver.Chrome(options=options)
+        self.driver = webdriver.Chrome(service=service, options=options,
+                                       seleniumwire_options=seleniumwire_options(self.capture_max))
+        self.driver.scopes = self.capture_scopes
+        if self.lean:
+            enable_resource_blocking(self.driver)
+        self.driver_calls = CommandCounter(self.driver)
+        self.governor.attach(self.driver.service.process.pid)
+        self.waiter = Waiter(self.driver, self.metrics, heartbeat=self.heartbeat)
+        self.driver.set_window_size(1920, 1080)
+        # self.driver.set_window_position(-2560, 0) # dual QHD monitor setting
+        if not self.headless:
             self.driver.minimize_window()
-            # if self.NF_pass_flag:
-            #     self.NF_pass_flag = False
-            # self.driver = webdriver.Chrome(executable_path=chromedriver_path)
-            # self.driver = webdriver.Chrome(r"F:\Code\Python\srt_reservation-main\chromedriver.exe")
-        except Exception as e:
-            print(f"오류 발생 : {e}")
+        # if self.NF_pass_flag:
+        #     self.NF_pass_flag = False
+        # self.driver = webdriver.Chrome(executable_path=chromedriver_path)
+        # self.driver = webdriver.Chrome(r"F:\Code\Python\srt_reservation-main\chromedriver.exe")
+
+    def heartbeat(self):
+        """긴 대기(NetFunnel) 중에도 드라이버가 응답하고 있으면 watchdog 에 진행 중임을 알린다"""
+        self.last_progress = time.monotonic()
+
+    def start_browser(self):
+        """드라이버를 띄우고 (저장된 세션 또는 로그인으로) 조회 페이지를 연다"""
+        self.run_driver()
+        for job in self.jobs:
+            job.http_form = None
+        if not self.restore_session():
+            self.login_with_backoff()
+            self.open_search_page()
+        self.last_progress = time.monotonic()
+
+    def stop_browser(self):
+        """
+        드라이버를 종료한다. 멈춘 드라이버 호출이 전용 스레드를 붙잡고 있을 수 있으므로
+        스레드는 기다리지 않고 새 스레드를 만든다.
+        """
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                print(f"드라이버 종료 오류 : {e}")
+            self.driver = None
+        self.executor.shutdown(wait=False)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="driver")
+
+    def open_search_page(self):
+        self.driver.get(f'{self.base_url}/hpg/hra/01/selectScheduleList.do')
+        self.form_job = None
+
+    def recycle(self, action):
+        """
+        사이클 사이(예약 클릭 중이 아닐 때)에 조회 탭이나 브라우저를 새로 만들고 조회 폼을 다시 채운다.
+
+        :param action: RECYCLE_TAB 또는 RECYCLE_BROWSER
+        """
+        with self.metrics.phase("recycle"):
+            if action == RECYCLE_TAB:
+                print("조회 탭을 새로 엽니다")
+                old_handle = self.driver.current_window_handle
+                self.driver.switch_to.new_window('tab')
+                new_handle = self.driver.current_window_handle
+                self.open_search_page()
+                self.driver.switch_to.window(old_handle)
+                self.driver.close()
+                self.driver.switch_to.window(new_handle)
+            else:
+                print(f"크롬 메모리 {self.governor.rss_mb:.0f}MB. 크롬을 새로 띄웁니다")
+                self.driver.quit()
+                self.driver = None
+                self.start_browser()
+            self.fill_search_form()
 
     def login(self):
-        self.driver.get('https://etk.srail.kr/cmc/01/selectLoginForm.do')
-        WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located((By.ID, 'srchDvNm01')))
+        self.driver.get(f'{self.base_url}/cmc/01/selectLoginForm.do')
+        self.waiter.until("login_form", EC.visibility_of_element_located((By.ID, 'srchDvNm01')))
         self.driver.find_element(By.ID, 'srchDvNm01').send_keys(str(self.login_id))
         self.driver.find_element(By.ID, 'hmpgPwdCphd01').send_keys(str(self.login_psw))
         self.driver.find_element(By.XPATH, '//*[@id="login-form"]/fieldset/div[1]/div[2]/div[2]/div/div[2]/input').click()
-        self.driver.implicitly_wait(15)
         return self.driver
 
     def check_login(self):
-        WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME, "my-name")))
+        self.waiter.until("login_result", EC.visibility_of_element_located((By.CLASS_NAME, "my-name")))
         menu_text = self.driver.find_element(By.CLASS_NAME, "my-name").text
         if "환영합니다" in menu_text:
             return True
         else:
             return False
 
+    def is_logged_in(self):
+        """현재 페이지 상단 메뉴로 로그인 상태를 확인 (대기 없이)"""
+        return any("환영합니다" in elm.text for elm in self.driver.find_elements(By.CLASS_NAME, "my-name"))
+
+    def login_with_backoff(self):
+        """로그인이 될 때까지 재시도. 실패가 반복되면 대기 시간을 2배씩 늘린다 (최대 login_backoff_max 초)"""
+        failures = 0
+        while True:
+            try:
+                self.login()
+                login_check = self.check_login()
+            except TimeoutException:
+                login_check = False
+            if login_check:
+                print("로그인 성공!")
+                if self.session_store is not None:
+                    self.session_store.save(self.driver.get_cookies())
+                return
+            failures += 1
+            delay = min(self.login_backoff_max, 2 ** (failures - 1)) * (0.5 + random() * 0.5)
+            self.metrics.inc("login_failures")
+            print(f"로그인 실패. {delay:.1f}초 후 다시 시도함.")
+            time.sleep(delay)
+
+    def restore_session(self):
+        """
+        저장된 쿠키로 로그인을 건너뛴다. 조회 페이지를 열어 로그인 상태가 유지되는지 확인하고
+        유효하지 않으면 저장된 세션을 지운다.
+
+        :return: 세션 복원 성공 여부 (성공 시 조회 페이지가 열려 있음)
+        """
+        if self.session_store is None:
+            return False
+        cookies = self.session_store.load()
+        if not cookies:
+            return False
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        from srt_reservation.session import to_cdp_cookies
+        self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": to_cdp_cookies(cookies)})
+        self.open_search_page()
+        if self.is_logged_in():
+            print("저장된 세션으로 로그인 성공!")
+            self.metrics.inc("session_restores")
+            return True
+        print("저장된 세션 만료. 다시 로그인함.")
+        self.session_store.clear()
+        self.driver.delete_all_cookies()
+        return False
+
     async def go_search(self):
+        """
+        조회 루프. 드라이버 호출은 전용 스레드에서 실행하고 이벤트 루프는 대기,
+        감시(watchdog), 텔레그램 명령 처리를 위해 비워둔다.
+        """
+        loop = asyncio.get_running_loop()
+
+        def call(fn, *args):
+            return loop.run_in_executor(self.executor, fn, *args)
+
+        self.search_task = asyncio.current_task()
+        self.wakeup = asyncio.Event()
+        self.stalled = False
+        self.last_progress = time.monotonic()
+        watchdog = asyncio.create_task(self.watchdog())
+        control = None
+        if self.control:
+            control = TelegramControl(self, self.token, self.chat_id, base_url=self.telegram_url)
+            try:
+                await control.start()
+            except Exception as e:
+                print(f"텔레그램 명령 수신 실패 : {e}")
+                control = None
+        try:
+            await call(self.fill_search_form)
+            if self.cnt_refresh == 0:
+                self.print_config()
+
+            # 조회하기 버튼 클릭
+            cycle_start = time.monotonic()
+            await call(self.submit_search, True)
+
+            while not self.stop_requested:
+                if await call(self.check_result):
+                    # 이 job 은 예약 완료. 남은 job 이 있으면 조회 페이지로 돌아가 이어서 조회
+                    print(f"{self.job.name} 예약 완료")
+                    if self.next_job() is None:
+                        self.is_booked = True
+                        print("예약 완료")
+                        return True
+                    await call(self.open_search_page)
+                else:
+                    self.next_job()
+                # 예약 시도가 끝난 사이클 사이에만 탭/브라우저를 재활용
+                action = self.governor.observe(time.monotonic() - cycle_start)
+                if action is not None:
+                    await call(self.recycle, action)
+
+                # 다시 조회하기
+                with self.metrics.phase("sleep"):
+                    idle = self.scheduler.seconds_until_active()
+                    if idle:
+                        print(f"활성 시간대가 아님. {idle / 60:.0f}분 후 다시 조회")
+                    delay = self.scheduler.next_delay()
+                    # 쉬는 동안(활성 시간대 대기 포함)은 멈춘 것으로 보지 않는다
+                    self.last_progress = time.monotonic() + delay
+                    if not await self.rest(delay):
+                        break
+                self.last_progress = time.monotonic()
+                self.scheduler.start()
+                cycle_start = time.monotonic()
+                await call(self.refresh)
+            print("조회 중단")
+            return False
+        except asyncio.CancelledError:
+            if not self.stalled:
+                raise
+            # watchdog 이 멈춘 조회를 취소함
+            raise StalledError(f"조회가 {self.watchdog_timeout}초 이상 진행되지 않음")
+        finally:
+            watchdog.cancel()
+            if control is not None:
+                await control.close()
+
+    async def rest(self, delay):
+        """
+        다음 조회까지 delay 초 쉰다. 몇 시간씩 쉬는 활성 시간대 대기 중에도 /stop 은 바로 받고,
+        일시정지 중이면 /resume 이 올 때까지 기다린다.
+
+        :return: 조회를 이어갈지 (중단 요청이면 False)
+        """
+        deadline = self.rest_until = time.monotonic() + delay
+        try:
+            while not self.stop_requested:
+                self.wakeup.clear()
+                if self.paused:
+                    await self.wakeup.wait()
+                    # 일시정지했던 시간은 watchdog 이 멈춘 것으로 보지 않게 한다
+                    self.last_progress = max(deadline, time.monotonic())
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return True
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return True
+            return False
+        finally:
+            self.rest_until = None
+
+    def wake(self):
+        """쉬고 있는 조회 루프를 깨운다 (텔레그램 /pause /resume /stop). 이벤트 루프 스레드에서 호출"""
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def next_job(self):
+        """
+        예약이 끝나지 않은 다음 job 으로 넘어간다 (job 이 하나면 그대로).
+
+        :return: 다음 job, 모두 예약했으면 None
+        """
+        start = self.jobs.index(self.job)
+        for offset in range(1, len(self.jobs) + 1):
+            job = self.jobs[(start + offset) % len(self.jobs)]
+            if not job.is_booked:
+                self.job = job
+                return job
+        return None
+
+    async def watchdog(self, interval=10):
+        """조회 진행이 watchdog_timeout 초 이상 멈추면 조회를 취소해 Supervisor 가 드라이버를 새로 띄우게 한다"""
+        while True:
+            await asyncio.sleep(interval)
+            idle = time.monotonic() - self.last_progress
+            if idle > self.watchdog_timeout and not self.paused:
+                self.metrics.inc("watchdog_stalls")
+                print(f"조회가 {idle:.0f}초 동안 진행되지 않음")
+                self.stalled = True
+                self.search_task.cancel()
+                return
+
+    def status_text(self):
+        jobs = "\n".join(job.status_text() for job in self.jobs)
+        now = time.monotonic()
+        if self.paused:
+            state = "일시정지 중"
+        elif self.rest_until is not None:
+            # 쉬는 동안 last_progress 는 다음 조회 시각이라 경과 시간 대신 남은 시간을 보여준다
+            state = f"대기 중, 다음 조회까지 {max(self.rest_until - now, 0):.0f}초"
+        else:
+            state = f"조회 중, 마지막 진행 {max(now - self.last_progress, 0):.0f}초 전"
+        return (f'{jobs}\n'
+                f'전체 새로고침 {self.cnt_refresh}회\n'
+                f'{state}')
+
+    def fill_search_form(self):
         # 기차 조회 페이지로 이동
         # self.driver.get('https://etk.srail.kr/hpg/hra/01/selectScheduleList.do')
-        self.driver.implicitly_wait(15)
-
-        # 출발지 입력
-        elm_dpt_stn = self.driver.find_element(By.ID, 'dptRsStnCdNm')
-        elm_dpt_stn.clear()
-        elm_dpt_stn.send_keys(self.dpt_stn)
-
-        # 도착지 입력
-        elm_arr_stn = self.driver.find_element(By.ID, 'arvRsStnCdNm')
-        elm_arr_stn.clear()
-        elm_arr_stn.send_keys(self.arr_stn)
-
-        # 출발 날짜 입력
-        elm_dpt_dt = self.driver.find_element(By.ID, "dptDt")
-        self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_dpt_dt)
-        Select(elm_dpt_dt).select_by_value(self.dpt_dt)
-
-        # 출발 시간 입력
-        elm_dpt_tm = self.driver.find_element(By.ID, "dptTm")
-        self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_dpt_tm)
-        Select(elm_dpt_tm).select_by_visible_text(self.dpt_tm)
-        
-        # 경로우대권 적용
-        if self.want_senior:
-            elm_psg_adult = self.driver.find_element(By.ID, "psgInfoPerPrnb1")
-            elm_psg_elder = self.driver.find_element(By.ID, "psgInfoPerPrnb4")
-            self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_psg_adult)
-            self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_psg_elder)
-            Select(elm_psg_adult).select_by_index(0)
-            Select(elm_psg_elder).select_by_index(1)
-
-        # 동반 어린이 적용
-        if self.want_child:
-            elm_psg_adult = self.driver.find_element(By.ID, "psgInfoPerPrnb1")
-            elm_psg_child = self.driver.find_element(By.ID, "psgInfoPerPrnb5")
-            self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_psg_adult)
-            self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_psg_child)
-            Select(elm_psg_adult).select_by_index(1)
-            Select(elm_psg_child).select_by_index(1)
-        
-        # elm_psg_child = self.driver.find_element_by_name("psgInfoPerPrnb5")
-        # self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_psg_child)
-        # Select(self.driver.find_element_by_name("psgInfoPerPrnb5")).select_by_value(self.psg_child)
-        if self.cnt_refresh == 0:
-            print("============================")
-            config_txt = (f'기차를 조회합니다\n'
-                          f'출발역:{self.dpt_stn} , 도착역:{self.arr_stn}\n'
-                          f'날짜:{self.dpt_dt}, 시간: {self.real_dpt_tm}시 이후\n'
-                          f'{self.num_trains_to_check}개의 기차 중 예약\n'
-                          f'예약 대기 사용: {self.want_reserve}\n'
-                          f'특실 여부: {self.want_special}\n'
-                          f'무조건 여부: {self.want_any}\n'
-                          f'경로우대 여부: {self.want_senior}')
-            print(config_txt)
-            # print("기차를 조회합니다")
-            # print(f"출발역:{self.dpt_stn} , 도착역:{self.arr_stn}\n날짜:{self.dpt_dt}, 시간: {self.real_dpt_tm}시 이후\n{self.num_trains_to_check}개의 기차 중 예약")
-            # # print(f"출발역:{self.dpt_stn} , 도착역:{self.arr_stn}\n날짜:{self.dpt_dt}, 시간: {self.dpt_tm}시 이후\n성인: {self.psg_adult}매, 아동: {self.psg_child}매\n{self.num_trains_to_check}개의 기차 중 예약")
-            # print(f"예약 대기 사용: {self.want_reserve}")
-            # print(f"특실 여부: {self.want_special}")
-            # print(f"무조건 여부: {self.want_any}")
-            if self.notify:
-                print("----------------------------")
-                print("텔레그램 test 메시지 전송")
-                print("메시지 안오면 확인 후 재실행")
-                await self.telegram_send(txt=config_txt)
-            print("============================")
-
-        # 조회하기 버튼 클릭
-        self.driver.find_element(By.XPATH, "//input[@value='조회하기']").click()
+        self.driver_calls.reset()
+        self.waiter.until("search_form", EC.presence_of_element_located((By.ID, 'dptRsStnCdNm')))
+
+        # 출발지, 도착지, 날짜, 시간, 승객 구성을 한 번에 입력
+        job = self.job
+        self.fill_form([
+            ("dptRsStnCdNm", "input", job.dpt_stn),
+            ("dptRsStnCd", "optional", job.dpt_station.code),
+            ("arvRsStnCdNm", "input", job.arr_stn),
+            ("arvRsStnCd", "optional", job.arr_station.code),
+            ("dptDt", "value", job.dpt_dt),
+            ("dptTm", "text", job.dpt_tm),
+        ] + self.passenger_fields())
+        self.form_job = job
+        job.form_dirty = False
+        self.sync_poller()
+
+    def prepare_form(self):
+        """
+        이번 조회의 job 조건으로 조회할 준비를 한다. 브라우저 조회는 폼을 다시 채우고,
+        HTTP 조회는 그 job 의 폼 값을 가져온 적이 있으면 브라우저를 건드리지 않고 보낼 값만 바꾼다.
+        """
+        job = self.job
+        if job.form_dirty:
+            if self.form_job is job:
+                self.fill_passengers()
+            else:
+                self.fill_search_form()
+        elif self.poller is not None and job.http_form is not None:
+            self.poller.form = job.http_form
+        elif self.form_job is not job:
+            self.fill_search_form()
+
+    def ensure_browser_form(self):
+        """브라우저로 조회하기 전에 조회 폼이 이번 job 조건인지 확인 (HTTP 조회는 폼 값만 바꿔 두므로)"""
+        if self.form_job is not self.job or self.job.form_dirty:
+            self.fill_search_form()
+
+    def sync_poller(self):
+        """HTTP 조회에 쓸 쿠키와 조회 폼 값을 브라우저에서 가져온다"""
+        if self.poller is None:
+            return
+        if not self.poller.sync(self.driver):
+            raise NoSuchElementException("HTTP 조회용 조회 폼을 찾지 못함")
+        self.job.http_form = self.poller.form
+
+    def passenger_fields(self):
+        return [(select_id, "value", str(count)) for select_id, count in self.job.party.counts().items()]
+
+    def fill_passengers(self):
+        self.fill_form(self.passenger_fields())
+        self.job.form_dirty = False
+        self.sync_poller()
+
+    def fill_form(self, fields):
+        """조회 폼 입력을 드라이버 호출 한 번으로 처리"""
+        missing = self.driver.execute_script(FILL_FORM_JS, fields)
+        if missing:
+            raise NoSuchElementException(f"조회 폼 입력 실패: {', '.join(missing)}")
+
+    def print_config(self):
+        print("============================")
+        lines = []
+        for job in self.jobs:
+            title = f'기차를 조회합니다 [{job.name}]' if len(self.jobs) > 1 else '기차를 조회합니다'
+            lines.append(f'{title}\n{job.config_text()}')
+        config_txt = "\n".join(lines)
+        if len(self.jobs) > 1:
+            config_txt += f'\n{len(self.jobs)}개 조건을 번갈아 조회 (전체 분당 최대 {self.scheduler.budget:g}회)'
+        print(config_txt)
+        if self.notifier is not None:
+            print("----------------------------")
+            print("텔레그램 test 메시지 전송")
+            print("메시지 안오면 확인 후 재실행")
+            self.send_notification(config_txt)
+        print("============================")
+
+    def check_result(self):
+        """
+        현재 job 의 조회 결과를 한 번 확인하고 예약 가능한 좌석이 있으면 예약한다.
+        결과가 없든 예약했든 조회 한 번은 사이클 하나로 마무리한다.
+
+        :return: 현재 job 의 목표 수량을 모두 예약했으면 True
+        """
+        job = self.job
         try:
-            # Wait until Netfunnel is not present
-            netfunnel = self.driver.find_element(By.ID, "NetFunnel_Loading_Popup")
-            print("NetFunnel 감지, 우회 시도")
-            if not self.NF_pass_flag:
-                wait = WebDriverWait(self.driver, 1800)
-                element = wait.until(EC.staleness_of(netfunnel))
-                for request in self.driver.requests:
-                    if request.response:
-                        if "nf.letskorail" and "opcode=5004" in request.url:
-                                key_idx0 = request.url.index("key=")
-                                key_idx1 = request.url.index("&nfid")
-                                self.key = request.url[key_idx0+4:key_idx1]
-                                self.NF_pass_flag = True
-                                print(f'{request.url}, 응답코드 {request.response.status_code}, 컨텐츠 유형: {request.response.headers["Content-Type"]}')
-                                print("Token : " + self.key)
-            time.sleep(1)
-        except StaleElementReferenceException:
-            self.driver.implicitly_wait(30)
-        except NoSuchElementException:
-            self.driver.implicitly_wait(3)
+            return self.judge_result(job)
+        finally:
+            self.cnt_refresh += 1
+            job.cnt_refresh += 1
+            self.metrics.inc("refreshes")
+            driver_calls = self.driver_calls.reset()
+            self.metrics.end_cycle(refresh=self.cnt_refresh, driver_calls=driver_calls)
+            print(f"새로고침 {self.cnt_refresh}회 (드라이버 호출 {driver_calls}회)")
+
+    def judge_result(self, job):
+        """조회 결과를 읽어 판단하고 예약을 시도한다. check_result 참고"""
+        self.last_progress = time.monotonic()
+        polled, self.polled = self.polled, None
+        if polled is not None:
+            rows, html = polled
+        else:
+            html = None
+            # 결과 테이블 전체를 한 번에 읽어 스냅샷으로 판단
+            with self.metrics.phase("read_table"):
+                rows = read_result_rows(self.driver)
+        if rows is None:
+            self.metrics.inc("no_result")
+            return False
+        if self.started_at is not None:
+            time_to_first_search = time.monotonic() - self.started_at
+            self.started_at = None
+            self.metrics.set("time_to_first_search_seconds", round(time_to_first_search, 3))
+            print(f"첫 조회까지 {time_to_first_search:.2f}초")
+        if self.recovering_since is not None:
+            self.metrics.observe("recovery", time.monotonic() - self.recovering_since)
+            with self.metrics.lock:
+                recovery = self.metrics.histograms["recovery"]
+                mttr = recovery.sum / recovery.count
+            self.metrics.set("mttr_seconds", round(mttr, 3))
+            self.recovering_since = None
+            print("복구 완료")
+        if self.history is not None:
+            with self.metrics.phase("history"):
+                self.history.record(job.dpt_stn, job.arr_stn, job.dpt_dt, rows)
+
+        if self.trace is not None:
+            if self.trace_job is not job:
+                # 재생 시 job 마다 다른 정책으로 판단하도록 job 이 바뀔 때마다 설정을 남긴다
+                self.trace.start(job.policy, job.allow_partial)
+                self.trace_job = job
+            # 예약 시도로 페이지가 바뀌기 전에 판단에 쓴 페이지를 남긴다
+            if html is None:
+                with self.metrics.phase("trace"):
+                    html = self.driver.page_source
+            with self.metrics.lock:
+                timings = dict(self.metrics.cycle)
+            party_total = job.party.total
+            booked_before = job.cnt_quantity
+
+        with self.metrics.phase("select"):
+            choices, shrink = job.policy.decide(rows, job.party.total, job.allow_partial)
+        if choices and polled is not None:
+            # HTTP 조회에서 좌석이 보이면 브라우저로 같은 조회를 해서 누를 페이지를 띄운다
+            self.metrics.inc("http_handoffs")
+            with self.metrics.phase("handoff"):
+                self.ensure_browser_form()
+                self.submit_search()
+                rows = read_result_rows(self.driver) or []
+                choices, shrink = job.policy.decide(rows, job.party.total, job.allow_partial)
+            if self.trace is not None:
+                html = self.driver.page_source
+        for row, seat_class in choices:
+            # 한 번이라도 예약하면 멈춘다. 남은 순위는 예약 전 인원으로 조회한 페이지 기준이므로
+            # 남은 승객은 폼을 다시 채운 다음 조회에서 판단한다
+            if self.book(row, CLASS_COLUMN[seat_class], CLASS_NAME[seat_class], check_success=seat_class != "reserve"):
+                break
+
+        if shrink:
+            # 인원만큼 좌석이 없으면 한 명 줄여서 다시 조회
+            party = job.party.shrink(job.passengers_left)
+            if party is None:
+                # 더 줄이면 보호자 없이 남는 어린이가 생기므로 지금 구성으로만 조회한다
+                job.allow_partial = False
+                self.trace_job = None  # 재생도 바뀐 설정으로 판단하도록 다음 기록에 설정을 다시 남긴다
+                print(f"좌석 부족. 보호자 없이 남는 어린이가 생겨 더 나누지 않고 조회: {job.party}")
+            else:
+                job.party = party
+                job.form_dirty = True
+                print(f"좌석 부족. 승객 구성을 줄여서 조회: {job.party}")
+
+        if self.trace is not None:
+            self.trace.record(html, timings, [[row.train_no, seat_class] for row, seat_class in choices], shrink,
+                              party_total, job.cnt_quantity - booked_before, refresh=self.cnt_refresh, job=job.name)
+
+        if not choices and not shrink:
+            # 예약 시도 결과(booking_*)와 섞이지 않게 정책이 고를 좌석이 없을 때만 센다
+            print("예약 불가")
+            self.metrics.inc("sold_out")
+        return job.is_booked
+
+    def refresh(self):
+        """다시 조회하고, 결과와 응답 시간을 스케줄러에 알린다. 대기는 호출하는 쪽에서 한다"""
+        self.prepare_form()
+        start = time.monotonic()
+        if self.poller is not None:
+            state = self.poll_http()
+        else:
+            state = self.submit_search()
+        self.scheduler.record(ok=state == "result", latency=time.monotonic() - start)
+        if state == "loaded" and self.poller is None and not self.is_logged_in():
+            raise LoggedOutError("로그인이 풀림")
+        return state
+
+    def poll_http(self):
+        """HTTP 로 조회. NetFunnel 대기열에 걸리거나 키를 받지 못하면 이번 조회는 브라우저로 한다 (대기 팝업 포함)"""
+        with self.metrics.phase("http_poll"):
+            state, rows, html = self.poller.poll()
+        if state == "netfunnel":
+            self.metrics.inc("http_netfunnel_handoffs")
+            self.ensure_browser_form()
+            state = self.submit_search()
+            self.sync_poller()
+            return state
+        self.polled = (rows, html)
+        return state
+
+    def submit_search(self, capture_key=False):
+        """조회하기 버튼을 다시 누르고 결과 페이지가 뜰 때까지 기다린다"""
+        with self.metrics.phase("submit"):
+            if not self.driver.execute_script(SUBMIT_SEARCH_JS):
+                self.driver.refresh()
+                self.driver.execute_script(SUBMIT_SEARCH_JS)
+        return self.wait_search_result(capture_key)
+
+    def wait_search_result(self, capture_key=False):
+        """
+        조회 결과 페이지가 뜰 때까지 기다린다. NetFunnel 대기 팝업이 있으면 사라질 때까지 기다린다.
 
+        :param capture_key: 대기 후 NetFunnel 키를 캡쳐해 이후 조회에 재사용할지 여부
+        :return: 'result', 'loaded', 시간 초과 시 None
+        """
+        search_state = lambda driver: driver.execute_script(SEARCH_STATE_JS, RESULT_TBODY)
+        netfunnel_gone = lambda driver: not driver.find_elements(By.ID, "NetFunnel_Loading_Popup")
         while True:
-            max_num_train = 1
             try:
-                tbody = self.driver.find_element(By.CSS_SELECTOR, f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody")
-                tr = tbody.find_elements(By.TAG_NAME, "tr")
-                max_num_train = len(tr)
-                self.num_trains_to_check = min(max_num_train, self.num_trains_to_check)
-            except NoSuchElementException:
-                submit = self.driver.find_element(By.XPATH, "//input[@value='조회하기']")
-                self.driver.execute_script("arguments[0].click();", submit)
-                try:
-                    # Wait until Netfunnel is not present
-                    NetFunnel = self.driver.find_element(By.ID, "NetFunnel_Loading_Popup")
-                    print("NetFunnel 감지, 우회 시도")
+                state = self.waiter.until("search_result", search_state, ignored_exceptions=(WebDriverException,))
+                if state != "netfunnel":
+                    return state
+
+                print("NetFunnel 감지, 우회 시도")
+                self.metrics.inc("netfunnel_hits")
+                with self.metrics.phase("netfunnel"):
                     if self.NF_pass_flag:
                         self.driver.execute_script("javascript:NetFunnel.gLastData.key='" + self.key + "'")
-                    wait = WebDriverWait(self.driver, 1800)
-                    element = wait.until(EC.staleness_of(NetFunnel))
-                    time.sleep(1)
-
-                    self.driver.implicitly_wait(30)
-                except TimeoutException:
-                    self.driver.implicitly_wait(30)
-                except StaleElementReferenceException:
-                    self.driver.implicitly_wait(3)
-                except NoSuchElementException:
-                    self.driver.implicitly_wait(3)
-
-            if self.dpt_tm != self.real_dpt_tm:
-                for idx in range(0, max_num_train):
-                    dpt = self.driver.find_element(By.CSS_SELECTOR,f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({1 + idx}) > td:nth-child(4)").text
-                    dpt_time = dpt.split('\n')[1]
-                    hour = dpt_time.split(':')[0]
-                    if hour == self.real_dpt_tm:
-                        self.dpt_tm_offset = idx
-                        break
-            else:
-                self.dpt_tm_offset = 0
+                    self.waiter.until("netfunnel", netfunnel_gone, progress_every=30)
+                    if capture_key and not self.NF_pass_flag:
+                        self.capture_netfunnel_key()
+            except TimeoutException:
+                return None
+
+    def capture_netfunnel_key(self):
+        key, request = find_netfunnel_key(self.driver)
+        if key is None:
+            return
+        self.key = key
+        self.NF_pass_flag = True
+        print(f'{request.url}, 응답코드 {request.response.status_code}, 컨텐츠 유형: {request.response.headers["Content-Type"]}')
+        print("Token : " + self.key)
+        # 키를 얻었으면 더 이상 캡쳐 기록이 필요 없으므로 비운다
+        del self.driver.requests
+
+    def book(self, row, col, seat_name, check_success=True):
+        """
+        조회 결과 행의 좌석 링크를 눌러 예약을 시도한다.
 
-            for i in range(1, self.num_trains_to_check + 1):
-                try:
-                    tr = self.driver.find_element(By.CSS_SELECTOR, f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i + self.dpt_tm_offset})")
-                    special_seat = tr.find_element(By.CSS_SELECTOR, "td:nth-child(6)").text
-                    standard_seat = tr.find_element(By.CSS_SELECTOR, "td:nth-child(7)").text
-                    reservation = tr.find_element(By.CSS_SELECTOR, "td:nth-child(8)").text
-                except StaleElementReferenceException:
-                    special_seat = "매진"
-                    standard_seat = "매진"
-                    reservation = "매진"
-                except NoSuchElementException:
-                    submit = self.driver.find_element(By.XPATH, "//input[@value='조회하기']")
-                    self.driver.execute_script("arguments[0].click();", submit)
-                    try:
-                        # Wait until Netfunnel is not present
-                        NetFunnel = self.driver.find_element(By.ID, "NetFunnel_Loading_Popup")
-                        print("NetFunnel 감지, 우회 시도")
-                        if self.NF_pass_flag:
-                            self.driver.execute_script("javascript:NetFunnel.gLastData.key='" + self.key + "'")
-                        wait = WebDriverWait(self.driver, 1800)
-                        element = wait.until(EC.staleness_of(NetFunnel))
-                        time.sleep(1)
-                        self.driver.implicitly_wait(30)
-                    except TimeoutException:
-                        self.driver.implicitly_wait(30)
-                    except StaleElementReferenceException:
-                        self.driver.implicitly_wait(3)
-                    except NoSuchElementException:
-                        self.driver.implicitly_wait(3)
-                
-                if self.want_special or self.want_any:
-                    if "예약하기" in special_seat:
-                        print("예약 가능 클릭")
-
-                        # Error handling in case that click does not work
-                        try:
-                            self.driver.find_element(By.CSS_SELECTOR, f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i + self.dpt_tm_offset}) > td:nth-child(6) > a").click()
-                        except ElementClickInterceptedException as err:
-                            print(err)
-                            self.driver.find_element(By.CSS_SELECTOR, f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i + self.dpt_tm_offset}) > td:nth-child(6) > a").send_keys(Keys.ENTER)
-                        finally:
-                            self.driver.implicitly_wait(3)
-
-                        # 예약이 성공하면
-                        if self.driver.find_elements(By.ID, 'isFalseGotoMain'):
-                            self.cnt_quantity += 1
-                            result_msg = str(self.cnt_quantity) + "/" + str(self.quantity) + " 번째 티켓"
-                            print(result_msg)
-                            print("일반실 예약 성공")
-                            booked_tm_dpt = self.driver.find_element(By.CSS_SELECTOR, f"#list-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr > td:nth-child(6)")
-                            booked_tm_arr = self.driver.find_element(By.CSS_SELECTOR, f"#list-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr > td:nth-child(7)")
-                            result_str = "출발시간 : " + booked_tm_dpt.text + " / 도착시간 : " + booked_tm_arr.text
-                            print(result_str)
-                            # if self.notify:
-                            #     asyncio.run(self.telegram_send(txt=result_msg))
-                            #     asyncio.run(self.telegram_send(txt="특실 예약 성공!"))
-                            #     asyncio.run(self.telegram_send(txt=result_str))
-                            if (self.cnt_quantity == self.quantity):
-                                self.is_booked = True
-                                break
-                            else:
-                                self.driver.back()  # 뒤로가기
-                                self.driver.implicitly_wait(5)
-                        else:
-                            print("특실 잔여석 없음. 다시 검색")
-                            self.driver.back()  # 뒤로가기
-                            try:
-                                # Wait until Netfunnel is not present
-                                NetFunnel = self.driver.find_element(By.ID, "NetFunnel_Loading_Popup")
-                                print("NetFunnel 감지, 우회 시도")
-                                if self.NF_pass_flag:
-                                    self.driver.execute_script("javascript:NetFunnel.gLastData.key='" + self.key + "'")
-                                wait = WebDriverWait(self.driver, 1800)
-                                element = wait.until(EC.staleness_of(NetFunnel))
-                                time.sleep(1)
-
-                            except TimeoutException:
-                                self.driver.implicitly_wait(3)
-                            except StaleElementReferenceException:
-                                self.driver.implicitly_wait(3)
-                            except NoSuchElementException:
-                                self.driver.implicitly_wait(3)
-
-                if ((not self.want_special) or self.want_any) and "예약하기" in standard_seat:
-                   print("예약 가능 클릭")
-
-                   # Error handling in case that click does not work
-                   try:
-                       wait = WebDriverWait(self.driver, 5)
-                       element = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i + self.dpt_tm_offset}) > td:nth-child(7) > a")))
-                       self.driver.find_element(By.CSS_SELECTOR, f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i + self.dpt_tm_offset}) > td:nth-child(7) > a").click()
-                   except ElementClickInterceptedException as err:
-                       print(err)
-                       self.driver.find_element(By.CSS_SELECTOR, f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i + self.dpt_tm_offset}) > td:nth-child(7) > a").send_keys(Keys.ENTER)
-                   finally:
-                       self.driver.implicitly_wait(3)
-
-                   # 예약이 성공하면
-                   if self.driver.find_elements(By.ID, 'isFalseGotoMain'):
-                       self.cnt_quantity += 1
-                       result_msg = str(self.cnt_quantity) + "/" + str(self.quantity) + " 번째 티켓"
-                       print(result_msg)
-                       print("일반실 예약 성공")
-                       booked_tm_dpt = self.driver.find_element(By.CSS_SELECTOR, f"#list-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr > td:nth-child(6)")
-                       booked_tm_arr = self.driver.find_element(By.CSS_SELECTOR, f"#list-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr > td:nth-child(7)")
-                       result_str ="출발시간 : " + booked_tm_dpt.text + " / 도착시간 : " + booked_tm_arr.text
-                       print(result_str)
-                       train_info = self.driver.find_element(By.CSS_SELECTOR, f"#list-form > fieldset > div:nth-child(6) > table > tbody > tr > td:nth-child(3)")
-                       print(train_info.text)
-                       # self.bot.sendMessage(chat_id=self.chat_id, text=result_msg)
-                       # self.bot.sendMessage(chat_id=self.chat_id, text="일반실 예약 성공!")
-                       # self.bot.sendMessage(chat_id=self.chat_id, text=result_str)
-                       # self.bot.sendMessage(chat_id=self.chat_id, text=train_info.text)
-                       result_msg_merge = f'{result_msg} \n일반실 예약 성공! \n{result_str} \n{train_info.text}'
-                       # asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-                       # asyncio.run(self.telegram_send(result_msg_merge))
-                       if self.notify:
-                           await self.telegram_send(txt=result_msg_merge)
-                       if(self.cnt_quantity == self.quantity):
-                           self.is_booked = True
-                           break
-                       else:
-                           self.driver.back()  # 뒤로가기
-                           self.driver.implicitly_wait(5)
-                   else:
-                       print("일반실 잔여석 없음. 다시 검색")
-                       self.driver.back()  # 뒤로가기
-                       try:
-                           # Wait until Netfunnel is not present
-                           NetFunnel = self.driver.find_element(By.ID, "NetFunnel_Loading_Popup")
-                           print("NetFunnel 감지, 우회 시도")
-                           if self.NF_pass_flag:
-                               self.driver.execute_script("javascript:NetFunnel.gLastData.key='" + self.key + "'")
-                           wait = WebDriverWait(self.driver, 1800)
-                           element = wait.until(EC.staleness_of(NetFunnel))
-                           time.sleep(1)
-                           self.driver.implicitly_wait(30)
-                       except TimeoutException:
-                           self.driver.implicitly_wait(3)
-                       except StaleElementReferenceException:
-                           self.driver.implicitly_wait(3)
-                       except NoSuchElementException:
-                           self.driver.implicitly_wait(3)
-
-                if self.want_reserve:
-                    if "신청하기" in reservation:
-                        print("예약 대기 완료")
-                        self.driver.find_element(By.CSS_SELECTOR, f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i + self.dpt_tm_offset}) > td:nth-child(8) > a").click()
-                        self.is_booked = True
-                        self.cnt_quantity += 1
-                        result_msg = str(self.cnt_quantity) + "/" + str(self.quantity) + " 번째 티켓"
-                        print(result_msg)
-                        booked_tm_dpt = self.driver.find_element(By.CSS_SELECTOR, f"#list-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr > td:nth-child(6)")
-                        booked_tm_arr = self.driver.find_element(By.CSS_SELECTOR, f"#list-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr > td:nth-child(7)")
-                        result_str = "출발시간 : " + booked_tm_dpt.text + " / 도착시간 : " + booked_tm_arr.text
-                        print(result_str)
-                        # if self.notify:
-                        #     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-                        #     asyncio.run(self.telegram_send(txt=result_msg))
-                        #     asyncio.run(self.telegram_send(txt="일반실 예약 대기 예약 성공!"))
-                        #     asyncio.run(self.telegram_send(txt=result_str))
-                        if (self.cnt_quantity == self.quantity):
-                            self.is_booked = True
-                            break
-                        else:
-                            self.driver.back()  # 뒤로가기
-                            self.driver.implicitly_wait(5)
-
-            if not self.is_booked:
-                print("예약 불가")
-                time.sleep(0.5 + random() * 0.5)  # 0.5~1초 랜덤으로 기다리기
-                self.cnt_refresh += 1
-                print(f"새로고침 {self.cnt_refresh}회")
-
-                # if self.cnt_refresh % 200 == 0 and self.cnt_refresh != 0:
-                #     current_handle = self.driver.current_window_handle
-                #     self.driver.execute_script("window.open('https://etk.srail.kr/hpg/hra/01/selectScheduleList.do');")
-                #     element = WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located((By.XPATH, "//input[@value='조회하기']")))
-                #     self.driver.switch_to.window(current_handle)
-                #     self.driver.close()
-                #     self.driver.switch_to.window(self.driver.window_handles[-1])
+        :param row: 예약할 TrainRow
+        :param col: 좌석 칸 번호 (6: 특실, 7: 일반실, 8: 예약 대기)
+        :param seat_name: 출력용 좌석 이름
+        :param check_success: 예약 확인 페이지(isFalseGotoMain)로 성공 여부를 확인할지 여부
+        :return: 이번 클릭으로 예약했으면 True (목표 수량을 다 채웠는지는 job.is_booked)
+        """
+        print("예약 가능 클릭")
+        link_css = f"{RESULT_TBODY} > tr:nth-child({row.index}) > td:nth-child({col}) > a"
+        self.metrics.inc("booking_attempts")
+
+        with self.metrics.phase("booking"):
+            receipt = self.commit_booking(link_css)
+        if receipt is None:
+            # 링크가 없거나 눌러도 페이지가 그대로
+            self.metrics.inc("booking_failures")
+            return False
+        booked = receipt.success or not check_success
+
+        if not booked:
+            self.metrics.inc("booking_failures")
+            print(f"{seat_name} 잔여석 없음. 다시 검색")
+            self.driver.back()  # 뒤로가기
+            self.wait_search_result()
+            return False
+
+        # 예약이 성공하면
+        job = self.job
+        job.cnt_quantity += job.party.total
+        job.passengers_left = job.passengers_left.minus(job.party)
+        result_msg = f"{job.cnt_quantity}/{job.quantity} 매 ({job.party})"
+        if len(self.jobs) > 1:
+            result_msg = f"[{job.name}] {result_msg}"
+        print(result_msg)
+        print(f"{seat_name} 예약 성공")
+        result_str = "출발시간 : " + receipt.dpt_tm + " / 도착시간 : " + receipt.arr_tm
+        print(result_str)
+        print(receipt.train_info)
+        result_msg_merge = f'{result_msg} \n{seat_name} 예약 성공! \n{result_str} \n{receipt.train_info}'
+        self.send_notification(result_msg_merge)
+
+        if job.cnt_quantity == job.quantity:
+            job.is_booked = True
+            return True
+        # 남은 인원으로 다시 조회
+        job.party = job.passengers_left
+        job.form_dirty = True
+        self.driver.back()  # 뒤로가기
+        self.wait_search_result()
+        return True
+
+    def commit_booking(self, link_css):
+        """
+        좌석 링크를 스크립트 한 번으로 누르고, 예약 확인 페이지로 넘어가면 결과를 한 번에 읽는다.
+        클릭부터 확인 페이지를 읽을 때까지의 시간을 click_to_confirm 으로 기록한다.
+
+        :param link_css: 누를 좌석 링크 CSS 선택자
+        :return: Confirmation, 링크가 없거나 페이지가 넘어가지 않았으면 None
+        """
+        if not self.driver.execute_script(CLICK_SEAT_JS, link_css):
+            return None
+        clicked = time.perf_counter()
+        read_receipt = lambda driver: driver.execute_script(READ_RECEIPT_JS)
+        try:
+            receipt = self.waiter.until("booking_result", read_receipt, ignored_exceptions=(WebDriverException,))
+        except TimeoutException:
+            if self.driver.execute_script(BOOKING_PENDING_JS):
+                return None
+            # 넘어간 페이지가 확인 페이지가 아님
+            return Confirmation(False)
+        self.metrics.observe("click_to_confirm", time.perf_counter() - clicked)
+        return Confirmation(**receipt)
 
-                # 다시 조회하기
-                try:
-                    submit = self.driver.find_element(By.XPATH, "//input[@value='조회하기']")
-                    self.driver.execute_script("arguments[0].click();", submit)
-                except NoSuchElementException:
-                    self.driver.refresh()
-                    submit = self.driver.find_element(By.XPATH, "//input[@value='조회하기']")
-                    self.driver.execute_script("arguments[0].click();", submit)
-
-                # Wait until Netfunnel is not present
-                try:
-                    # Wait until Netfunnel is not present
-                    NetFunnel = self.driver.find_element(By.ID, "NetFunnel_Loading_Popup")
-                    print("NetFunnel 감지, 우회 시도")
-                    if self.NF_pass_flag:
-                        self.driver.execute_script("javascript:NetFunnel.gLastData.key='" + self.key + "'")
-                    wait = WebDriverWait(self.driver, 1800)
-                    element = wait.until(EC.staleness_of(NetFunnel))
-                except TimeoutException:
-                    self.driver.implicitly_wait(30)
-                except StaleElementReferenceException:
-                    self.driver.implicitly_wait(3)
-                except NoSuchElementException:
-                    self.driver.implicitly_wait(3)
-            else:
-                print("예약 완료")
-                return True
     # TODO
     #def pay(self):
 
     def run(self, login_id, login_psw):
-        result = False
-        self.run_driver()
-        login_check = False
-        while not login_check:
-            self.set_log_info(login_id, login_psw)
-            self.login()
-            login_check = self.check_login()
-            if not login_check:
-                print("로그인 실패. 다시 시도함.")
-            else:
-                print("로그인 성공!")
-        self.driver.get('https://etk.srail.kr/hpg/hra/01/selectScheduleList.do')
-        asyncio.run(self.go_search())
-        # while not result:
-        #     asyncio.run(self.refresh_search_result())
-        self.driver.quit()
\ No newline at end of file
+        self.started_at = time.monotonic()
+        self.set_log_info(login_id, login_psw)
+        try:
+            return Supervisor(self, max_restarts=self.max_restarts, window=self.restart_window).run()
+        finally:
+            self.executor.shutdown(wait=False)
+            if self.notifier is not None:
+                self.notifier.close()
+            print(self.metrics.summary())
+            self.metrics.close()
+            if self.history is not None:
+                self.history.close()
+            if self.trace is not None:
+                self.trace.close()
+            if self.poller is not None:
+                self.poller.close()
+            if self.driver is not None:
+                self.driver.quit()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# 히스토그램 버킷 경계 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """버킷 경계 기준 근사 분위수"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+
+class _Phase:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """
+    조회 루프 계측. 항상 켜둘 수 있도록 메모리 집계만 하고 파일 쓰기는 사이클 단위로 모아서 한다.
+    기록은 드라이버 스레드에서, 읽기(/stats)는 이벤트 루프 스레드에서 하므로 집계는 lock 안에서만 바꾸고 읽는다.
+
+    :param jsonl_path: 사이클마다 한 줄씩 기록할 JSON-lines 파일 경로 (None 이면 사용 안 함)
+    :param prom_path: Prometheus textfile collector 용 파일 경로 (None 이면 사용 안 함)
+    :param prom_interval: Prometheus 파일 갱신 주기 (초)
+    """
+
+    def __init__(self, jsonl_path=None, prom_path=None, prom_interval=10.0, prefix="srt"):
+        self.prefix = prefix
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.cycle = {}  # 현재 사이클의 단계별 소요 시간
+        self.lock = threading.Lock()
+        self.jsonl_path = jsonl_path
+        self.prom_path = prom_path
+        self.prom_interval = prom_interval
+        self._jsonl = open(jsonl_path, "a", encoding="utf-8") if jsonl_path else None
+        self._prom_written = 0.0
+
+    def phase(self, name):
+        """with metrics.phase('submit'): ... 형태로 단계 소요 시간을 잰다"""
+        return _Phase(self, name)
+
+    def observe(self, name, seconds):
+        with self.lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+            hist.observe(seconds)
+            self.cycle[name] = self.cycle.get(name, 0.0) + seconds
+
+    def inc(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def end_cycle(self, **fields):
+        """사이클 종료 시 호출. 단계별 시간을 JSON-lines 로 남기고 주기적으로 Prometheus 파일을 갱신한다"""
+        with self.lock:
+            cycle, self.cycle = self.cycle, {}
+        if self._jsonl is not None:
+            record = {"ts": round(time.time(), 3)}
+            record.update((name, round(value, 6)) for name, value in cycle.items())
+            record.update(fields)
+            self._jsonl.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._jsonl.flush()
+        if self.prom_path and time.monotonic() - self._prom_written >= self.prom_interval:
+            self.write_prom()
+
+    def write_prom(self):
+        with self.lock:
+            lines = self._prom_lines()
+        # textfile collector 가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓰고 교체
+        tmp_path = self.prom_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.prom_path)
+        self._prom_written = time.monotonic()
+
+    def _prom_lines(self):
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {self.prefix}_{name}_total counter")
+            lines.append(f"{self.prefix}_{name}_total {value}")
+        for name, value in sorted(self.gauges.items()):
+            lines.append(f"# TYPE {self.prefix}_{name} gauge")
+            lines.append(f"{self.prefix}_{name} {value}")
+        for name, hist in sorted(self.histograms.items()):
+            metric = f"{self.prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, n in zip(hist.buckets, hist.counts):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {hist.count}')
+            lines.append(f"{metric}_sum {hist.sum:.6f}")
+            lines.append(f"{metric}_count {hist.count}")
+        return lines
+
+    def summary(self):
+        """카운터와 단계별 p50/p99 한 줄 요약. 다른 스레드(텔레그램 /stats)에서 불러도 된다"""
+        with self.lock:
+            parts = [f"{name}={value}" for name, value in sorted(self.counters.items())]
+            parts += [f"{name} p50={hist.quantile(0.5):.3f}s p99={hist.quantile(0.99):.3f}s"
+                      for name, hist in sorted(self.histograms.items())]
+        return ", ".join(parts)
+
+    def close(self):
+        if self.prom_path:
+            self.write_prom()
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+from collections import deque
+
+
+class StdoutSink:
+    name = "stdout"
+
+    def send(self, text):
+        print(f"[알림] {text}")
+
+
+class FileSink:
+    name = "file"
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, text):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {text}\n")
+
+
+class TelegramSink:
+    """
+    텔레그램 봇으로 전송. 알림 작업 스레드 안에서 자체 이벤트 루프로 보낸다.
+
+    :param token: 텔레그램 봇 token
+    :param chat_id: 텔레그램 봇 chat_id
+    :param base_url: 봇 API 주소 (로컬 대역 봇 사용 시 변경)
+    """
+    name = "telegram"
+
+    def __init__(self, token, chat_id, base_url=None):
+        from telegram import Bot
+        from telegram.request import HTTPXRequest
+
+        # HTTPXRequest로 타임아웃 설정
+        request = HTTPXRequest(
+            connect_timeout=10,
+            read_timeout=20,
+        )
+        kwargs = {"base_url": base_url} if base_url else {}
+        self.bot = Bot(token=token, request=request, **kwargs)
+        self.chat_id = chat_id
+        self._loop = None
+
+    def send(self, text):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self.bot.send_message(chat_id=self.chat_id, text=text))
+
+
+class Notifier:
+    """
+    알림을 큐에 넣고 백그라운드 스레드에서 보낸다. 예약 루프는 전송을 기다리지 않는다.
+    짧은 시간 안에 몰린 알림은 한 메시지로 합치고, 실패한 전송은 싱크별로 백오프하며 재시도한다.
+    큐가 가득 차면 가장 오래된 알림부터 버린다.
+
+    :param sinks: send(text) 를 가진 전송 대상 목록
+    :param max_queue: 큐 최대 길이
+    :param batch_window: 첫 알림 후 이 시간(초) 동안 들어온 알림을 합친다
+    :param max_retries: 싱크별 최대 재시도 횟수
+    :param retry_max: 재시도 대기 최대 초
+    :param metrics: 전송/실패/버림 횟수를 기록할 Metrics
+    """
+
+    def __init__(self, sinks, max_queue=100, batch_window=1.0, max_retries=5, retry_max=60.0, metrics=None):
+        self.sinks = list(sinks)
+        self.max_queue = max_queue
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.retry_max = retry_max
+        self.metrics = metrics
+        if metrics is not None:
+            # 작업 스레드에서 새 키가 생기지 않도록 미리 등록
+            for name in ("notify_sent", "notify_failed", "notify_dropped"):
+                metrics.inc(name, 0)
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="notifier", daemon=True)
+        self._thread.start()
+
+    def notify(self, text):
+        """알림 추가 (대기하지 않음)"""
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self._count("notify_dropped")
+            self._queue.append(text)
+            self._cond.notify()
+
+    def close(self, timeout=30.0):
+        """남은 알림을 보내고 작업 스레드를 끝낸다"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _count(self, name):
+        if self.metrics is not None:
+            self.metrics.inc(name)
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            # 첫 알림 이후 잠시 더 모아서 한 번에 보낸다
+            deadline = time.monotonic() + self.batch_window
+            while not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = list(self._queue)
+            self._queue.clear()
+        return "\n\n".join(batch)
+
+    def _run(self):
+        while True:
+            text = self._next_batch()
+            if text is None:
+                return
+            for sink in self.sinks:
+                self._send(sink, text)
+
+    def _send(self, sink, text):
+        for attempt in range(self.max_retries + 1):
+            try:
+                sink.send(text)
+                self._count("notify_sent")
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"{sink.name} 메세지 전송 실패: {e}")
+                    self._count("notify_failed")
+                    return
+                time.sleep(min(self.retry_max, 2 ** attempt))
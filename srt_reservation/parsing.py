@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+import re
+from html import unescape
+from html.parser import HTMLParser
+
+from srt_reservation.snapshot import TrainRow
+
+# 자식 요소로 집계는 하지만 닫는 태그가 없는 요소들
+_VOID_TAGS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input",
+                        "link", "meta", "param", "source", "track", "wbr"))
+# innerText 에서 줄바꿈을 만드는 블록 요소들
+_BLOCK_TAGS = frozenset(("div", "p", "li", "ul", "ol", "dl", "dt", "dd", "h1", "h2", "h3", "h4", "h5", "h6"))
+
+# 결과 테이블을 HTMLParser 없이 문자열 검색으로 읽을 때 쓰는 패턴 (_scan_tbody)
+_TBL_WRAP_TBODY = re.compile(r'<div\b[^>]*\bclass\s*=\s*["\']?[^"\'>]*\btbl_wrap\b.*?<tbody\b[^>]*>(.*?)</tbody>',
+                             re.S | re.I)
+_ROW = re.compile(r'<tr\b[^>]*>(.*?)</tr>', re.S | re.I)
+_CELL = re.compile(r'<td\b[^>]*>(.*?)</td>', re.S | re.I)
+_CELL_BREAK = re.compile(r'<br\b[^>]*>|</?(?:%s)\b[^>]*>' % "|".join(_BLOCK_TAGS), re.I)
+_TAG = re.compile(r'<[^>]*>')
+
+
+class Confirmation:
+    """
+    예약 확인 페이지 파싱 결과
+
+    :param success: 예약 성공 여부 (isFalseGotoMain 요소 존재 여부)
+    :param dpt_tm: 출발 시간
+    :param arr_tm: 도착 시간
+    :param train_info: 열차 정보 (호차, 좌석 등)
+    """
+    __slots__ = ("success", "dpt_tm", "arr_tm", "train_info")
+
+    def __init__(self, success, dpt_tm="", arr_tm="", train_info=""):
+        self.success = success
+        self.dpt_tm = dpt_tm
+        self.arr_tm = arr_tm
+        self.train_info = train_info
+
+    def __repr__(self):
+        return f"Confirmation({self.success}, {self.dpt_tm!r}, {self.arr_tm!r}, {self.train_info!r})"
+
+
+class _FormTables(HTMLParser):
+    """
+    form 하나 안의 table 들을 (fieldset 자식 번호, 컨테이너 class, 행 목록) 으로 모은다.
+    셀 텍스트는 브라우저의 innerText 처럼 <br> 과 블록 요소 경계를 줄바꿈으로 취급한다.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self._stack = []  # [tag, 자식 수, nth-child, class]
+        self._fieldset_depth = None
+        self._table = None
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            parent[1] += 1
+        nth = parent[1] if parent is not None else 1
+
+        if tag == "br" or tag in _BLOCK_TAGS:
+            if self._cell is not None:
+                self._cell.append("\n")
+            if tag == "br":
+                return
+        if tag in _VOID_TAGS:
+            return
+
+        if tag in ("td", "th"):
+            self._close_cell()
+        elif tag == "tr":
+            self._close_row()
+
+        self._stack.append([tag, 0, nth, dict(attrs).get("class") or ""])
+
+        if tag == "fieldset" and self._fieldset_depth is None:
+            self._fieldset_depth = len(self._stack)
+        elif tag == "table" and self._table is None:
+            container = self._fieldset_child()
+            self._table = (container[2], container[3], []) if container else (0, "", [])
+        elif tag == "tr" and self._table is not None:
+            self._row = []
+        elif tag == "td" and self._row is not None:
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS:
+            return
+        if tag in _BLOCK_TAGS and self._cell is not None:
+            self._cell.append("\n")
+        # 닫는 태그와 맞는 요소까지 스택을 정리 (생략된 </td>, </tr> 허용)
+        for pos in range(len(self._stack) - 1, -1, -1):
+            if self._stack[pos][0] == tag:
+                break
+        else:
+            return
+        while len(self._stack) > pos:
+            popped = self._stack.pop()[0]
+            if popped == "td":
+                self._close_cell()
+            elif popped == "tr":
+                self._close_row()
+            elif popped == "table" and self._table is not None:
+                self.tables.append(self._table)
+                self._table = None
+            elif popped == "fieldset" and self._fieldset_depth is not None and len(self._stack) < self._fieldset_depth:
+                self._fieldset_depth = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def _fieldset_child(self):
+        if self._fieldset_depth is None or len(self._stack) <= self._fieldset_depth:
+            return None
+        return self._stack[self._fieldset_depth]
+
+    def _close_cell(self):
+        if self._cell is not None:
+            lines = (line.strip() for line in "".join(self._cell).split("\n"))
+            self._row.append("\n".join(line for line in lines if line))
+            self._cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self._row is not None:
+            if self._row:
+                self._table[2].append(self._row)
+            self._row = None
+
+
+def _decode(html, encoding):
+    if isinstance(html, bytes):
+        return html.decode(encoding, errors="replace")
+    return html
+
+
+def _form_html(text, form_id):
+    # 페이지 전체 대신 해당 form 영역만 잘라서 파싱
+    match = re.search(r'<form[^>]*\bid\s*=\s*["\']?%s\b' % re.escape(form_id), text)
+    if not match:
+        return None
+    end = text.find("</form>", match.end())
+    return text[match.start():] if end < 0 else text[match.start():end + len("</form>")]
+
+
+def _form_tables(text, form_id):
+    form = _form_html(text, form_id)
+    if form is None:
+        return None
+    parser = _FormTables()
+    parser.feed(form)
+    parser.close()
+    return parser.tables
+
+
+def _cell_text(cell):
+    # innerText 처럼 <br> 과 블록 요소 경계는 줄바꿈, 나머지 태그는 지운다
+    if "<" in cell:
+        cell = _TAG.sub("", _CELL_BREAK.sub("\n", cell))
+    if "&" in cell:
+        cell = unescape(cell)
+    if "\n" not in cell:
+        return cell.strip()
+    return "\n".join(line for line in (line.strip() for line in cell.split("\n")) if line)
+
+
+def _scan_tbody(form):
+    """
+    form 안의 tbl_wrap 결과 테이블 <tbody> 를 잘라 행/셀을 문자열 검색으로 읽는다.
+    중첩 table, 생략된 </td> </tr> 처럼 정규식으로 확실히 읽을 수 없는 모양이면 None (HTMLParser 로 읽는다)
+    """
+    match = _TBL_WRAP_TBODY.search(form)
+    if match is None:
+        return None
+    tbody = match.group(1)
+    lowered = tbody.lower()
+    if "<table" in lowered:
+        return None
+    rows = [_CELL.findall(row) for row in _ROW.findall(tbody)]
+    if len(rows) != lowered.count("<tr") or sum(map(len, rows)) != lowered.count("<td"):
+        return None
+    return [[_cell_text(cell) for cell in cells] for cells in rows if cells]
+
+
+def parse_schedule(html, encoding="utf-8"):
+    """
+    조회 결과 페이지(selectScheduleList.do)에서 #result-form 의 열차 목록을 읽는다.
+    결과 tbody 만 잘라 문자열 검색으로 읽고, 모양이 예상과 다르면 form 전체를 HTMLParser 로 읽는다.
+
+    :param html: 페이지 HTML (bytes 또는 str)
+    :return: TrainRow 목록, 결과 테이블이 없으면 None
+    """
+    form = _form_html(_decode(html, encoding), "result-form")
+    if form is None:
+        return None
+    table_rows = _scan_tbody(form)
+    if table_rows is None:
+        tables = [table for table in _form_tables(form, "result-form") or () if "tbl_wrap" in table[1]]
+        if not tables:
+            return None
+        table_rows = tables[0][2]
+    rows = []
+    for cells in table_rows:
+        if len(cells) < 8:
+            continue
+        rows.append(TrainRow.from_cells(len(rows) + 1, cells[2:8]))
+    return rows
+
+
+def parse_confirmation(html, encoding="utf-8"):
+    """
+    예약 확인 페이지에서 성공 여부와 #list-form 의 출발/도착 시간, 열차 정보를 읽는다.
+
+    :param html: 페이지 HTML (bytes 또는 str)
+    :return: Confirmation
+    """
+    text = _decode(html, encoding)
+    if not re.search(r'\bid\s*=\s*["\']?isFalseGotoMain\b', text):
+        return Confirmation(False)
+    confirmation = Confirmation(True)
+    for nth, css_class, rows in _form_tables(text, "list-form") or ():
+        if not rows:
+            continue
+        cells = rows[0]
+        if "tbl_wrap" in css_class and not confirmation.dpt_tm and len(cells) >= 7:
+            confirmation.dpt_tm = cells[5]
+            confirmation.arr_tm = cells[6]
+        elif nth == 6 and len(cells) >= 3:
+            confirmation.train_info = cells[2]
+    return confirmation
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+from srt_reservation.exceptions import InvalidPassengerError
+
+MAX_PASSENGERS = 9  # 한 번에 예약 가능한 최대 인원
+
+# 조회 폼의 인원 select id
+PASSENGER_SELECTS = {"adults": "psgInfoPerPrnb1", "seniors": "psgInfoPerPrnb4", "children": "psgInfoPerPrnb5"}
+
+
+class Passengers:
+    """
+    한 번의 예약 클릭으로 잡을 승객 구성
+
+    :param adults: 어른 수
+    :param seniors: 경로 수
+    :param children: 어린이 수
+    """
+    __slots__ = ("adults", "seniors", "children")
+
+    def __init__(self, adults=1, seniors=0, children=0):
+        self.adults = adults
+        self.seniors = seniors
+        self.children = children
+
+    @classmethod
+    def from_args(cls, args):
+        """
+        --adults/--seniors/--children 을 주면 그대로 쓰고, 없으면 기존 옵션에서 만든다.
+        --senior 는 경로 quantity 명, --child 는 어른과 어린이 quantity 명씩, 기본은 어른 quantity 명.
+        """
+        if args.adults is not None or args.seniors is not None or args.children is not None:
+            party = cls(args.adults or 0, args.seniors or 0, args.children or 0)
+        elif args.senior:
+            party = cls(0, args.quantity, 0)
+        elif args.child:
+            party = cls(args.quantity, 0, args.quantity)
+        else:
+            party = cls(args.quantity, 0, 0)
+        if min(party.adults, party.seniors, party.children) < 0 or not 0 < party.total <= MAX_PASSENGERS:
+            raise InvalidPassengerError(f"인원 오류. 총 인원은 1~{MAX_PASSENGERS}명이어야 합니다. ({party})")
+        if not party.guarded():
+            raise InvalidPassengerError("인원 오류. 어린이는 어른 또는 경로와 함께 예약해야 합니다.")
+        return party
+
+    @property
+    def total(self):
+        return self.adults + self.seniors + self.children
+
+    def guarded(self):
+        """어린이가 있으면 어른이나 경로가 함께 있는지"""
+        return not self.children or bool(self.adults or self.seniors)
+
+    def shrink(self, left=None):
+        """
+        한 명 줄인 구성. 어른, 경로, 어린이 순으로 줄이되, 줄인 구성과 그 구성으로 예약하고 남는 승객
+        모두 어린이에게 보호자가 있어야 한다. ex) 어른 1, 어린이 2 는 어느 쪽이든 어린이만 남으므로 줄일 수 없다
+
+        :param left: 아직 예약하지 못한 승객 전체 (기본: 이 구성)
+        :return: 줄인 구성, 그렇게 줄일 수 없으면 None
+        """
+        left = left or self
+        if self.total <= 1:
+            return None
+        for name in self.__slots__:
+            if not getattr(self, name):
+                continue
+            counts = {slot: getattr(self, slot) for slot in self.__slots__}
+            counts[name] -= 1
+            party = Passengers(**counts)
+            if party.guarded() and left.minus(party).guarded():
+                return party
+        return None
+
+    def minus(self, other):
+        return Passengers(self.adults - other.adults, self.seniors - other.seniors, self.children - other.children)
+
+    def counts(self):
+        """{select id: 인원} (조회 폼 입력용)"""
+        return {PASSENGER_SELECTS[name]: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        return f"어른 {self.adults}, 경로 {self.seniors}, 어린이 {self.children}"
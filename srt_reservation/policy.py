@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+from bisect import bisect_left
+from datetime import datetime
+
+from srt_reservation.exceptions import InvalidSeatClassError, InvalidTimeFormatError
+
+# 좌석 등급별 결과 테이블 칸 번호와 출력용 이름
+CLASS_COLUMN = {"special": 6, "standard": 7, "reserve": 8}
+CLASS_NAME = {"special": "특실", "standard": "일반실", "reserve": "예약 대기"}
+
+AVAILABLE = "예약하기"
+WAITLIST_OPEN = "신청하기"
+SHORT_OF_SEATS = "좌석부족"  # 남은 좌석이 요청 인원보다 적음
+
+
+def _hhmm(text, name):
+    if text is None:
+        return None
+    try:
+        return datetime.strptime(text, "%H:%M").strftime("%H:%M")
+    except ValueError:
+        raise InvalidTimeFormatError(f"{name} 오류. '{text}' 은/는 HH:MM 형식이어야 합니다.")
+
+
+class SelectionPolicy:
+    """
+    조회 결과 스냅샷에서 예약을 시도할 (행, 좌석 등급) 순서를 정한다. 드라이버 없이 동작한다.
+
+    :param earliest: 이 시각 이후 출발 열차부터 확인 HH:MM
+    :param max_trains: earliest 이후 확인할 열차 수 (선호 열차는 이 범위 밖이어도 확인)
+    :param latest_departure: 이 시각까지 출발하는 열차만 HH:MM
+    :param latest_arrival: 이 시각까지 도착하는 열차만 HH:MM
+    :param preferred_trains: 먼저 시도할 열차 번호 (앞쪽이 우선)
+    :param classes: 시도할 좌석 등급 우선순위 ex) ('standard', 'special')
+    :param waitlist: 좌석이 하나도 없을 때 예약 대기 신청 여부
+    """
+
+    def __init__(self, earliest=None, max_trains=2, latest_departure=None, latest_arrival=None,
+                 preferred_trains=(), classes=("standard",), waitlist=False):
+        self.earliest = _hhmm(earliest, "출발 시각")
+        self.max_trains = max_trains
+        self.latest_departure = _hhmm(latest_departure, "최종 출발 시각")
+        self.latest_arrival = _hhmm(latest_arrival, "최종 도착 시각")
+        self.preferred = {train: rank for rank, train in enumerate(preferred_trains)}
+        for seat_class in classes:
+            if seat_class not in ("special", "standard"):
+                raise InvalidSeatClassError(f"좌석 등급 오류. '{seat_class}' 은/는 special, standard 중 하나여야 합니다.")
+        self.classes = tuple(classes)
+        self.waitlist = waitlist
+
+    @classmethod
+    def from_args(cls, args):
+        """기존 CLI 옵션(--special, --any, --reserve, --num)과 새 옵션을 정책으로 변환"""
+        if args.classes:
+            classes = tuple(name.strip() for name in args.classes.split(","))
+        elif args.any:
+            classes = ("special", "standard")
+        elif args.special:
+            classes = ("special",)
+        else:
+            classes = ("standard",)
+        preferred = tuple(train.strip() for train in args.trains.split(",")) if args.trains else ()
+        return cls(earliest=f"{str(args.tm).zfill(2)}:00", max_trains=args.num,
+                   latest_departure=args.latest, latest_arrival=args.arrive_by,
+                   preferred_trains=preferred, classes=classes, waitlist=bool(args.reserve))
+
+    def config(self):
+        """생성자 인자로 되돌린 설정 (기록/재생용)"""
+        return {"earliest": self.earliest, "max_trains": self.max_trains,
+                "latest_departure": self.latest_departure, "latest_arrival": self.latest_arrival,
+                "preferred_trains": sorted(self.preferred, key=self.preferred.get),
+                "classes": list(self.classes), "waitlist": self.waitlist}
+
+    def candidates(self, rows):
+        """
+        earliest 이후 max_trains 개와 그 뒤의 선호 열차 중 시간 조건을 만족하는 행.
+        rows 와 반환값 모두 출발 시각 순
+        """
+        start = 0
+        if self.earliest is not None:
+            start = bisect_left([row.dpt_tm for row in rows], self.earliest)
+        end = start + self.max_trains
+        trains = list(rows[start:end]) + [row for row in rows[end:] if row.train_no in self.preferred]
+        selected = []
+        for row in trains:
+            if self.latest_departure is not None and row.dpt_tm > self.latest_departure:
+                break
+            if self.latest_arrival is not None and row.arr_tm > self.latest_arrival:
+                continue
+            selected.append(row)
+        return selected
+
+    def rank(self, rows):
+        """
+        시도할 순서대로 (행, 좌석 등급) 목록을 반환.
+        선호 열차 -> 출발 시각 순으로, 열차마다 좌석 등급 우선순위대로, 예약 대기는 맨 뒤에 둔다.
+        """
+        trains = sorted(self.candidates(rows), key=lambda row: self.preferred.get(row.train_no, len(self.preferred)))
+        choices = [(row, seat_class) for row in trains for seat_class in self.classes
+                   if AVAILABLE in getattr(row, seat_class)]
+        if self.waitlist:
+            choices += [(row, "reserve") for row in trains if WAITLIST_OPEN in row.reserve]
+        return choices
+
+    def short_of_seats(self, rows):
+        """원하는 등급에 좌석은 있지만 인원만큼은 없는 열차가 있는지"""
+        return any(SHORT_OF_SEATS in getattr(row, seat_class)
+                   for row in self.candidates(rows) for seat_class in self.classes)
+
+    def decide(self, rows, party_total, allow_partial):
+        """
+        한 번의 조회 결과에 대한 판단. 조회 루프와 trace 재생이 같이 쓴다.
+
+        :param party_total: 지금 조회한 승객 수
+        :param allow_partial: 좌석이 부족하면 인원을 줄여 나눠 예약할지
+        :return: (시도할 (행, 좌석 등급) 목록, 인원을 한 명 줄여 다시 조회할지)
+        """
+        choices = self.rank(rows)
+        shrink = not choices and allow_partial and party_total > 1 and self.short_of_seats(rows)
+        return choices, bool(shrink)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from random import random
+
+from srt_reservation.exceptions import InvalidTimeFormatError
+
+
+def parse_window(text):
+    """'HH:MM-HH:MM' 형태의 활성 시간대를 ((h, m), (h, m)) 로 변환"""
+    try:
+        start, end = (datetime.strptime(tm.strip(), "%H:%M") for tm in text.split("-"))
+        return (start.hour, start.minute), (end.hour, end.minute)
+    except ValueError:
+        raise InvalidTimeFormatError(f"시간대 형식 오류. '{text}' 은/는 HH:MM-HH:MM 형식이어야 합니다.")
+
+
+class PollScheduler:
+    """
+    재조회 간격을 정한다. 사이클이 끝날 때마다 간격만큼 쉬므로 (사이클 시간을 빼지 않음)
+    느린 사이클 뒤에 바로 다시 조회하지 않고, 최대 요청 빈도를 넘지 않는다. 오류나 느린 응답이 이어지면
+    간격을 지수적으로 늘렸다가 정상 응답마다 조금씩 줄인다. 활성 시간대를 주면 그 밖에서는 쉰다.
+
+    :param max_rate: 분당 최대 조회 수 (예의상 상한)
+    :param jitter: 간격에 더할 무작위 비율 ex) 1.0 이면 간격의 0~100% 를 더함
+    :param max_interval: 백오프 시 최대 간격 (초)
+    :param backoff: 오류/지연 시 간격 배수
+    :param recovery: 정상 응답 시 간격 배수 (1보다 작게)
+    :param slow_after: 이 시간(초)보다 오래 걸린 조회는 느린 응답으로 본다
+    :param windows: 활성 시간대 목록 ex) ['06:55-07:30', '23:50-00:20']
+    :param metrics: 현재 간격과 예산 사용률을 기록할 Metrics
+    """
+
+    def __init__(self, max_rate=120, jitter=1.0, max_interval=60.0, backoff=2.0, recovery=0.8,
+                 slow_after=5.0, windows=None, metrics=None):
+        self.min_interval = 60.0 / max_rate
+        self.budget = max_rate
+        self.jitter = jitter
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.recovery = recovery
+        self.slow_after = slow_after
+        self.windows = [parse_window(window) for window in windows or ()]
+        self.metrics = metrics
+
+        self.interval = self.min_interval
+        self.recent = deque()  # 최근 60초 간의 조회 시각
+
+    def record(self, ok=True, latency=0.0):
+        """조회 결과를 반영해 다음 간격을 조정한다"""
+        if not ok or latency > self.slow_after:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        else:
+            self.interval = max(self.min_interval, self.interval * self.recovery)
+
+    def seconds_until_active(self, now=None):
+        """활성 시간대까지 남은 초. 활성 시간대 안이거나 설정이 없으면 0"""
+        if not self.windows:
+            return 0.0
+        now = now or datetime.now()
+        minutes = now.hour * 60 + now.minute
+        waits = []
+        for (sh, sm), (eh, em) in self.windows:
+            start, end = sh * 60 + sm, eh * 60 + em
+            inside = start <= minutes < end if start <= end else (minutes >= start or minutes < end)
+            if inside:
+                return 0.0
+            waits.append((start - minutes) % (24 * 60))
+        target = (now + timedelta(minutes=min(waits))).replace(second=0, microsecond=0)
+        return max(0.0, (target - now).total_seconds())
+
+    def next_delay(self):
+        """사이클이 끝난 뒤 다음 조회까지 쉴 시간 (초). 활성 시간대 밖이면 시간대 시작까지"""
+        idle = self.seconds_until_active()
+        if idle:
+            return idle
+        return self.interval * (1 + self.jitter * random())
+
+    def start(self):
+        """조회 시작을 기록한다 (예산 사용률 집계용)"""
+        now = time.monotonic()
+        self.recent.append(now)
+        while self.recent and now - self.recent[0] > 60:
+            self.recent.popleft()
+        if self.metrics is not None:
+            self.metrics.set("poll_interval_seconds", round(self.interval, 3))
+            self.metrics.set("poll_budget_used_ratio", round(len(self.recent) / self.budget, 3))
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import base64
+import hashlib
+import json
+import os
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+DEFAULT_SESSION_DIR = os.path.join(os.path.expanduser("~"), ".cache", "srt_macro", "sessions")
+
+_SALT_SIZE = 16
+_KDF_ITERATIONS = 200_000
+
+
+class SessionStore:
+    """
+    로그인 쿠키를 회원번호별로 암호화해 저장한다.
+    암호화 키는 비밀번호에서 파생하므로 비밀번호 없이는 복호화할 수 없다.
+
+    :param login_id: 회원번호 (파일 이름은 해시로만 사용)
+    :param login_psw: 비밀번호 (암호화 키 파생용)
+    :param directory: 세션 파일 저장 폴더
+    """
+
+    def __init__(self, login_id, login_psw, directory=DEFAULT_SESSION_DIR):
+        self.login_psw = str(login_psw)
+        name = hashlib.sha256(str(login_id).encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(directory, name + ".session")
+
+    def _fernet(self, salt):
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=_KDF_ITERATIONS)
+        return Fernet(base64.urlsafe_b64encode(kdf.derive(self.login_psw.encode("utf-8"))))
+
+    def save(self, cookies):
+        salt = os.urandom(_SALT_SIZE)
+        token = self._fernet(salt).encrypt(json.dumps(cookies).encode("utf-8"))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(salt + token)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        """저장된 쿠키 목록. 없거나 복호화에 실패하면 None"""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            return json.loads(self._fernet(data[:_SALT_SIZE]).decrypt(data[_SALT_SIZE:]))
+        except (InvalidToken, ValueError):
+            return None
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def to_cdp_cookies(cookies):
+    """driver.get_cookies() 결과를 CDP Network.setCookies 형식으로 변환 (페이지 이동 없이 쿠키 설정용)"""
+    converted = []
+    for cookie in cookies:
+        item = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly") if key in cookie}
+        if "expiry" in cookie:
+            item["expires"] = cookie["expiry"]
+        if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+            item["sameSite"] = cookie["sameSite"]
+        converted.append(item)
+    return converted
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+import json
+
+RESULT_TBODY = "#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody"
+
+# 조회 결과 테이블 전체를 한 번의 execute_script 로 읽어오는 스크립트
+# 각 행은 [열차번호, 출발, 도착, 특실, 일반실, 예약대기] 배열로 반환
+READ_RESULT_TABLE_JS = """
+var tbody = document.querySelector(arguments[0]);
+if (!tbody) { return null; }
+var rows = [];
+var trs = tbody.querySelectorAll(':scope > tr');
+for (var i = 0; i < trs.length; i++) {
+    var tds = trs[i].children;
+    var row = [];
+    for (var j = 2; j < 8; j++) {
+        row.push(j < tds.length ? tds[j].innerText.trim() : "");
+    }
+    rows.push(row);
+}
+return JSON.stringify(rows);
+"""
+
+# 조회하기 버튼 클릭. 이전 페이지에 표시를 남겨 새 결과 페이지와 구분한다
+SUBMIT_SEARCH_JS = """
+var submit = document.querySelector("input[value='조회하기']");
+if (!submit) { return false; }
+document.documentElement.setAttribute('data-srt-submitted', '1');
+submit.click();
+return true;
+"""
+
+# 조회 후 페이지 상태: 'netfunnel' (대기 팝업), 'result' (결과 테이블), 'loaded' (결과 없이 로드 완료), null (이동 중)
+SEARCH_STATE_JS = """
+if (document.getElementById('NetFunnel_Loading_Popup')) { return 'netfunnel'; }
+if (document.documentElement.hasAttribute('data-srt-submitted')) { return null; }
+if (document.querySelector(arguments[0])) { return 'result'; }
+return document.readyState === 'complete' ? 'loaded' : null;
+"""
+
+
+class TrainRow:
+    """
+    조회 결과 한 행의 스냅샷. DOM 대신 이 값으로 예약 여부를 판단한다.
+
+    :param index: 결과 테이블에서의 행 번호 (tr:nth-child 값, 1부터 시작)
+    :param train_no: 열차 번호
+    :param dpt_tm: 출발 시간 hh:mm
+    :param arr_tm: 도착 시간 hh:mm
+    :param special: 특실 좌석 상태 ex) 예약하기, 매진
+    :param standard: 일반실 좌석 상태
+    :param reserve: 예약 대기 상태 ex) 신청하기
+    """
+    __slots__ = ("index", "train_no", "dpt_tm", "arr_tm", "special", "standard", "reserve")
+
+    def __init__(self, index, train_no, dpt_tm, arr_tm, special, standard, reserve):
+        self.index = index
+        self.train_no = train_no
+        self.dpt_tm = dpt_tm
+        self.arr_tm = arr_tm
+        self.special = special
+        self.standard = standard
+        self.reserve = reserve
+
+    @classmethod
+    def from_cells(cls, index, cells):
+        train_no, dpt, arr, special, standard, reserve = cells
+        return cls(index, train_no, _cell_time(dpt), _cell_time(arr), special, standard, reserve)
+
+    def __repr__(self):
+        return (f"TrainRow({self.index}, {self.train_no!r}, {self.dpt_tm!r}, {self.arr_tm!r}, "
+                f"{self.special!r}, {self.standard!r}, {self.reserve!r})")
+
+
+def _cell_time(text):
+    # "동탄\n08:00" 형태에서 시간만 추출
+    lines = text.split('\n')
+    return lines[1].strip() if len(lines) > 1 else lines[0].strip()
+
+
+def decode_rows(payload):
+    """READ_RESULT_TABLE_JS 의 결과(JSON 문자열)를 TrainRow 목록으로 변환. 테이블이 없으면 None"""
+    if payload is None:
+        return None
+    return [TrainRow.from_cells(i, cells) for i, cells in enumerate(json.loads(payload), start=1)]
+
+
+def read_result_rows(driver):
+    """조회 결과 테이블을 드라이버 호출 한 번으로 읽는다"""
+    return decode_rows(driver.execute_script(READ_RESULT_TABLE_JS, RESULT_TBODY))
+
+
+class CommandCounter:
+    """
+    드라이버가 브라우저로 보내는 명령 수를 센다.
+    WebElement 의 명령도 결국 driver.execute 를 거치므로 함께 집계된다.
+    """
+
+    def __init__(self, driver):
+        self.count = 0
+        execute = driver.execute
+
+        def counted_execute(*args, **kwargs):
+            self.count += 1
+            return execute(*args, **kwargs)
+
+        driver.execute = counted_execute
+
+    def reset(self):
+        count = self.count
+        self.count = 0
+        return count
+
+# 조회 폼 입력을 한 번의 execute_script 로 처리. arguments[0] 은 [id, 방식, 값] 목록
+# 방식: 'input' (값 입력), 'value'/'text' (select 의 option 을 값/표시 문구로 선택), 'optional' (있을 때만 입력)
+# 숨겨진 select 는 보이게 바꾸고 change 이벤트를 보낸다. 찾지 못한 id 목록을 반환
+FILL_FORM_JS = """
+var missing = [];
+arguments[0].forEach(function (field) {
+    var id = field[0], how = field[1], value = field[2];
+    var el = document.getElementById(id);
+    if (!el) {
+        if (how !== 'optional') { missing.push(id); }
+        return;
+    }
+    if (how === 'value' || how === 'text') {
+        el.style.display = '';
+        var found = false;
+        for (var i = 0; i < el.options.length; i++) {
+            var option = el.options[i];
+            if ((how === 'value' ? option.value : option.text.trim()) === value) {
+                el.selectedIndex = i;
+                found = true;
+                break;
+            }
+        }
+        if (!found) { missing.push(id); return; }
+    } else {
+        el.value = value;
+    }
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+});
+return missing;
+"""
+
+# 좌석 링크를 스크립트로 한 번에 누른다. 이전 페이지에 표시를 남겨 예약 확인 페이지로 넘어갔는지 구분한다
+CLICK_SEAT_JS = """
+var link = document.querySelector(arguments[0]);
+if (!link) { return false; }
+document.documentElement.setAttribute('data-srt-booking', '1');
+link.click();
+return true;
+"""
+
+# 예약 확인 페이지의 성공 여부와 출발/도착 시간, 열차 정보를 한 번에 읽는다. 아직 이동 중이면 null
+READ_RECEIPT_JS = """
+if (document.documentElement.hasAttribute('data-srt-booking') || document.readyState === 'loading') { return null; }
+function text(css) {
+    var el = document.querySelector(css);
+    return el ? el.innerText.trim() : "";
+}
+var cell = "#list-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr > td:nth-child(";
+return {
+    success: !!document.getElementById('isFalseGotoMain'),
+    dpt_tm: text(cell + "6)"),
+    arr_tm: text(cell + "7)"),
+    train_info: text("#list-form > fieldset > div:nth-child(6) > table > tbody > tr > td:nth-child(3)")
+};
+"""
+
+# 좌석 링크를 누른 뒤에도 페이지가 그대로인지 (이동하지 않았는지)
+BOOKING_PENDING_JS = "return document.documentElement.hasAttribute('data-srt-booking');"
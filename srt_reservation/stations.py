@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from difflib import get_close_matches
+
+from srt_reservation.exceptions import InvalidStationNameError
+
+# 노선: 수서~오송 구간은 경부/호남 공용, 이후 갈라진다
+TRUNK, GYEONGBU, HONAM = "공용", "경부", "호남"
+
+
+class Station:
+    """
+    SRT 정차역
+
+    :param name: 조회 폼에 입력하는 역 이름
+    :param code: SRT 역 코드
+    :param line: 노선 (공용, 경부, 호남)
+    :param order: 수서에서부터의 정차 순서 (같은 노선 안에서 비교)
+    """
+    __slots__ = ("name", "code", "line", "order")
+
+    def __init__(self, name, code, line, order):
+        self.name = name
+        self.code = code
+        self.line = line
+        self.order = order
+
+    def __repr__(self):
+        return f"Station({self.name!r}, {self.code!r}, {self.line!r}, {self.order})"
+
+
+STATIONS = (
+    Station("수서", "0551", TRUNK, 0),
+    Station("동탄", "0552", TRUNK, 1),
+    Station("평택지제", "0553", TRUNK, 2),
+    Station("천안아산", "0502", TRUNK, 3),
+    Station("오송", "0297", TRUNK, 4),
+    Station("대전", "0010", GYEONGBU, 5),
+    Station("김천(구미)", "0507", GYEONGBU, 6),
+    Station("동대구", "0015", GYEONGBU, 7),
+    Station("신경주", "0508", GYEONGBU, 8),
+    Station("울산(통도사)", "0509", GYEONGBU, 9),
+    Station("부산", "0020", GYEONGBU, 10),
+    Station("공주", "0514", HONAM, 5),
+    Station("익산", "0030", HONAM, 6),
+    Station("정읍", "0033", HONAM, 7),
+    Station("광주송정", "0036", HONAM, 8),
+    Station("나주", "0037", HONAM, 9),
+    Station("목포", "0041", HONAM, 10),
+)
+
+# 흔히 쓰는 다른 이름 -> 조회 폼의 역 이름
+ALIASES = {
+    "김천": "김천(구미)",
+    "구미": "김천(구미)",
+    "울산": "울산(통도사)",
+    "통도사": "울산(통도사)",
+    "경주": "신경주",
+    "평택": "평택지제",
+    "지제": "평택지제",
+    "천안": "천안아산",
+    "아산": "천안아산",
+    "광주": "광주송정",
+    "송정": "광주송정",
+    "대구": "동대구",
+}
+
+BY_NAME = {station.name: station for station in STATIONS}
+BY_NAME.update({alias: BY_NAME[name] for alias, name in ALIASES.items()})
+
+
+def lookup(name, role="역"):
+    """
+    역 이름(별칭 포함)으로 Station 을 찾는다. 공백은 무시한다.
+
+    :param role: 오류 메시지에 쓸 이름 ex) 출발역
+    """
+    station = BY_NAME.get(str(name).replace(" ", ""))
+    if station is None:
+        suggestions = get_close_matches(str(name), list(BY_NAME), n=3, cutoff=0.4)
+        hint = f" 혹시 {', '.join(dict.fromkeys(BY_NAME[s].name for s in suggestions))} 인가요?" if suggestions else ""
+        raise InvalidStationNameError(f"{role} 오류. '{name}' 은/는 목록에 없습니다.{hint}")
+    return station
+
+
+def check_route(dpt, arr):
+    """출발역과 도착역 사이에 SRT 열차가 다니는지 확인 (경부선과 호남선 사이는 직통 열차가 없다)"""
+    if dpt is arr:
+        raise InvalidStationNameError(f"노선 오류. 출발역과 도착역이 같습니다. ({dpt.name})")
+    if TRUNK not in (dpt.line, arr.line) and dpt.line != arr.line:
+        raise InvalidStationNameError(f"노선 오류. {dpt.name}({dpt.line}선)과 {arr.name}({arr.line}선) 사이에는 SRT 열차가 없습니다.")
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import sys
+import time
+from collections import deque
+
+from selenium.common.exceptions import (ElementClickInterceptedException, JavascriptException, NoSuchElementException,
+                                        StaleElementReferenceException, TimeoutException, WebDriverException)
+from urllib3.exceptions import HTTPError as DriverConnectionError
+
+from srt_reservation.exceptions import LoggedOutError, RestartLimitError, StalledError
+
+# 실패 종류
+TRANSIENT = "transient"  # 페이지 상태 문제. 조회 페이지를 다시 열면 된다
+DRIVER_DEAD = "driver_dead"  # 크롬/드라이버가 죽음. 드라이버를 새로 띄운다
+LOGGED_OUT = "logged_out"  # 로그인이 풀림. 다시 로그인한다
+STALLED = "stalled"  # watchdog_timeout 동안 진행 없음. 드라이버를 새로 띄운다
+FATAL = "fatal"  # 복구하지 않고 종료
+
+# 드라이버 세션이 더 이상 쓸 수 없음을 뜻하는 WebDriverException 메시지
+DRIVER_DEAD_MARKERS = ("invalid session id", "chrome not reachable", "disconnected", "no such window",
+                       "session deleted", "target window already closed", "tab crashed",
+                       "unable to receive message from renderer")
+
+
+def classify(exc):
+    """예외를 실패 종류로 분류"""
+    if isinstance(exc, StalledError):
+        return STALLED
+    if isinstance(exc, LoggedOutError):
+        return LOGGED_OUT
+    if isinstance(exc, (TimeoutException, StaleElementReferenceException, NoSuchElementException,
+                        ElementClickInterceptedException, JavascriptException)):
+        return TRANSIENT
+    requests = sys.modules.get("requests")  # --http_poll 일 때만 불러온다
+    if requests is not None and isinstance(exc, requests.RequestException):
+        # HTTP 조회 실패. 조회 폼부터 다시 채우면 된다
+        return TRANSIENT
+    if isinstance(exc, WebDriverException):
+        message = (exc.msg or str(exc)).lower()
+        return DRIVER_DEAD if any(marker in message for marker in DRIVER_DEAD_MARKERS) else TRANSIENT
+    if isinstance(exc, (ConnectionError, DriverConnectionError)):
+        # chromedriver 프로세스가 죽어 명령 전송 자체가 실패
+        return DRIVER_DEAD
+    return FATAL
+
+
+class Supervisor:
+    """
+    SRT 조회 루프를 감싸 실패를 분류하고 복구한다.
+    예약 수량, 새로고침 횟수 등 진행 상태는 SRT 객체에 그대로 남아 있으므로 드라이버만 새로 띄우면 이어서 조회한다.
+    복구 시각부터 다음 조회 결과를 읽을 때까지를 recovery 히스토그램(평균: mttr_seconds)으로 기록한다.
+
+    :param srt: SRT
+    :param max_restarts: window 초 안에 허용할 최대 복구 횟수. 넘으면 RestartLimitError
+    :param window: 복구 횟수를 세는 구간 (초)
+    :param backoff_max: 복구 전 대기 시간 상한 (초). 연속 복구마다 2배씩 늘어난다
+    """
+
+    def __init__(self, srt, max_restarts=5, window=600, backoff_max=60):
+        self.srt = srt
+        self.max_restarts = max_restarts
+        self.window = window
+        self.backoff_max = backoff_max
+        self.restarts = deque()  # 최근 복구 시각
+
+    def run(self):
+        """예약이 끝나거나 중단 요청이 올 때까지 조회. go_search 결과를 반환"""
+        while True:
+            try:
+                if self.srt.driver is None:
+                    self.srt.start_browser()
+                return asyncio.run(self.srt.go_search())
+            except Exception as e:
+                kind = classify(e)
+                if kind == FATAL:
+                    raise
+                self.recover(kind, e)
+
+    def recover(self, kind, exc):
+        srt = self.srt
+        now = time.monotonic()
+        while self.restarts and now - self.restarts[0] > self.window:
+            self.restarts.popleft()
+        if len(self.restarts) >= self.max_restarts:
+            message = f"{self.window}초 안에 이미 {len(self.restarts)}회 복구함. 종료합니다. ({kind}: {exc})"
+            srt.send_notification(message)
+            raise RestartLimitError(message) from exc
+        self.restarts.append(now)
+        srt.metrics.inc(f"failures_{kind}")
+        if srt.recovering_since is None:
+            srt.recovering_since = now
+
+        delay = min(self.backoff_max, 2 ** (len(self.restarts) - 1))
+        message = f"오류 발생 ({kind}): {str(exc).strip().splitlines()[0] if str(exc).strip() else type(exc).__name__}"
+        print(f"{message}\n{delay}초 후 복구 시도")
+        srt.send_notification(f"{message}\n{srt.status_text()}")
+        time.sleep(delay)
+
+        if kind in (DRIVER_DEAD, STALLED):
+            srt.stop_browser()
+            return
+        try:
+            if kind == LOGGED_OUT:
+                if srt.session_store is not None:
+                    srt.session_store.clear()
+                srt.login_with_backoff()
+            srt.open_search_page()
+        except Exception as e:
+            # 페이지도 다시 못 열면 드라이버를 새로 띄운다
+            print(f"복구 실패 : {e}")
+            srt.stop_browser()
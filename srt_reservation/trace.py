@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+조회 사이클 기록(trace)과 오프라인 재생
+
+--trace 로 실행하면 사이클마다 결과 페이지 HTML, 단계별 소요 시간, 선택 결과를
+gzip JSON-lines 파일에 쓴다. 파일이 max_bytes 를 넘으면 trace.jsonl.gz.1, .2 ... 로 돌린다.
+실행할 때마다 이전 실행의 파일을 먼저 돌려서, 비정상 종료로 잘린 파일 뒤에 이어 쓰지 않는다.
+
+재생은 브라우저 없이 기록된 HTML 을 parse_schedule 로 읽고 조회 루프와 같은 SelectionPolicy.decide 로
+다시 판단해 기록된 판단과 비교하고 판단 지연 시간을 잰다.
+
+    python -m srt_reservation.trace trace.jsonl.gz --speed 100
+    python -m srt_reservation.trace trace.jsonl.gz.1 trace.jsonl.gz --speed 0 --classes special,standard
+"""
+import argparse
+import gzip
+import json
+import os
+import time
+import zlib
+
+from srt_reservation.parsing import parse_schedule
+from srt_reservation.policy import SelectionPolicy
+
+
+class TraceRecorder:
+    """
+    :param path: 기록 파일 경로 (gzip)
+    :param max_bytes: 이 크기(압축 후)를 넘으면 파일을 돌린다
+    :param backups: 남겨둘 이전 파일 수
+    """
+
+    def __init__(self, path, max_bytes=50 * 1024 * 1024, backups=5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.header = None
+        self._raw = None
+        self._gz = None
+        self._opened = False
+
+    def _open(self):
+        if not self._opened:
+            self._opened = True
+            # 이전 실행이 비정상 종료했으면 마지막 gzip 멤버가 잘려 있을 수 있다.
+            # 그 뒤에 이어 쓰면 읽을 수 없으므로 이전 파일은 돌려두고 새 파일로 시작한다
+            if os.path.exists(self.path) and os.path.getsize(self.path):
+                self._rotate()
+        self._raw = open(self.path, "ab")
+        self._gz = gzip.GzipFile(fileobj=self._raw, mode="ab")
+        if self.header is not None:
+            self._write(self.header)
+
+    def _rotate(self):
+        self._close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def _write(self, record):
+        self._gz.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        # 비정상 종료 시에도 마지막 사이클까지 읽을 수 있도록
+        self._gz.flush()
+
+    def start(self, policy, allow_partial):
+        """실행 설정을 기록. 파일을 돌려도 새 파일 맨 앞에 다시 쓴다"""
+        self.header = {"type": "config", "ts": round(time.time(), 3),
+                       "policy": policy.config(), "allow_partial": bool(allow_partial)}
+        if self._gz is None:
+            self._open()
+        else:
+            self._write(self.header)
+
+    def record(self, html, timings, choices, shrink, party_total, booked, **fields):
+        """
+        사이클 하나를 기록
+
+        :param html: 판단에 쓴 결과 페이지 HTML
+        :param timings: 단계별 소요 시간 {이름: 초}
+        :param choices: 판단 결과 [[열차번호, 좌석 등급]]
+        :param shrink: 인원을 줄였는지
+        :param party_total: 판단 당시 인원 수
+        :param booked: 이번 사이클에 예약에 성공한 인원 수
+        """
+        if self._gz is None:
+            self._open()
+        record = {"type": "cycle", "ts": round(time.time(), 3),
+                  "timings": {name: round(value, 6) for name, value in timings.items()},
+                  "choices": choices, "shrink": shrink, "party": party_total, "booked": booked}
+        record.update(fields)
+        record["html"] = html
+        self._write(record)
+        if self._raw.tell() >= self.max_bytes:
+            self._rotate()
+            self._open()
+
+    def _close(self):
+        if self._gz is not None:
+            self._gz.close()
+            self._raw.close()
+            self._gz = None
+            self._raw = None
+
+    def close(self):
+        self._close()
+
+
+def read_trace(paths):
+    """
+    기록 파일들을 순서대로 읽어 레코드를 하나씩 돌려준다.
+    비정상 종료로 잘리거나 깨진 파일도 읽을 수 있는 데까지 읽고 다음 파일로 넘어간다.
+    """
+    for path in paths:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        break
+        except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+            print(f"{path}: 읽다가 멈춤 ({type(e).__name__}: {e}). 다음 파일로 넘어갑니다.")
+            continue
+
+
+def replay(records, policy=None, speed=0.0):
+    """
+    기록을 재생하며 판단을 다시 내리고 기록과 비교한다.
+
+    :param policy: 사용할 정책 (None 이면 기록된 설정으로 만든다)
+    :param speed: 실제 시간 대비 재생 배속 (0 이면 기다리지 않음)
+    :return: {"cycles", "mismatches": [(ts, 기록, 재생)], "latencies": [초]}
+    """
+    result = {"cycles": 0, "mismatches": [], "latencies": []}
+    current = policy
+    allow_partial = False
+    previous_ts = None
+    for record in records:
+        if record.get("type") == "config":
+            if policy is None:
+                current = SelectionPolicy(**record["policy"])
+            allow_partial = record.get("allow_partial", False)
+            continue
+        if current is None:
+            raise ValueError("기록에 정책 설정이 없습니다. 정책을 직접 지정해주세요.")
+        if speed and previous_ts is not None:
+            time.sleep(max(0.0, record["ts"] - previous_ts) / speed)
+        previous_ts = record["ts"]
+
+        start = time.perf_counter()
+        rows = parse_schedule(record["html"]) or []
+        ranked, shrink = current.decide(rows, record.get("party", 1), allow_partial)
+        choices = [[row.train_no, seat_class] for row, seat_class in ranked]
+        result["latencies"].append(time.perf_counter() - start)
+        result["cycles"] += 1
+        if choices != record["choices"] or shrink != record["shrink"]:
+            result["mismatches"].append((record["ts"], (record["choices"], record["shrink"]), (choices, shrink)))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded SRT search cycles offline")
+    parser.add_argument("paths", nargs="+", help="Trace files, oldest first", metavar="trace.jsonl.gz")
+    parser.add_argument("--speed", help="Replay speed relative to real time (0: as fast as possible)", type=float, default=0.0)
+    parser.add_argument("--classes", help="Override seat class priority", type=str, metavar="standard,special")
+    parser.add_argument("--num", help="Override number of trains to check", type=int, metavar="2")
+    args = parser.parse_args(argv)
+
+    records = list(read_trace(args.paths))
+    policy = None
+    if args.classes or args.num:
+        config = next((record["policy"] for record in records if record.get("type") == "config"), {})
+        if args.classes:
+            config["classes"] = [name.strip() for name in args.classes.split(",")]
+        if args.num:
+            config["max_trains"] = args.num
+        policy = SelectionPolicy(**config)
+
+    result = replay(records, policy=policy, speed=args.speed)
+    latencies = sorted(result["latencies"])
+    print(f"사이클 {result['cycles']}개 재생, 판단 불일치 {len(result['mismatches'])}개")
+    if latencies:
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"판단 지연 p50={p50 * 1000:.2f}ms p99={p99 * 1000:.2f}ms")
+    for ts, recorded, replayed in result["mismatches"]:
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))}  기록 {recorded}  재생 {replayed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import re
+import time
+from urllib.parse import parse_qsl
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from srt_reservation.exceptions import LoggedOutError
+from srt_reservation.parsing import parse_schedule
+
+# NetFunnel 대기열 서버. 페이지의 netfunnel.js 설정(TS_HOST)을 못 읽으면 이 주소를 쓴다
+NETFUNNEL_URL = "https://nf.letskorail.com/ts.wseq"
+NETFUNNEL_SERVICE = "service_1"  # 조회 버튼에 걸린 대기열 서비스/액션 id
+NETFUNNEL_ACTION = "act_10"
+NETFUNNEL_KEY_FIELD = "netfunnelKey"  # 조회 요청에 키를 실어 보내는 필드 (폼에 같은 이름이 없을 때)
+NETFUNNEL_RESULT = re.compile(r"result='(\d+):(\d+):([^']*)'")
+# NetFunnel 요청 종류
+OPCODE_ENTER = "5101"  # 키 발급 + 진입 확인 (getTidchkEnter)
+OPCODE_COMPLETE = "5004"  # 사용 완료 (setComplete)
+NETFUNNEL_PASS = "200"  # 바로 진입 (201 이면 대기열)
+
+# 조회 폼이 실제로 보내는 값과 주소를 그대로 가져온다 (브라우저가 채운 값, 숨은 필드 포함)
+SEARCH_FORM_JS = """
+var form = document.getElementById('search-form') || (document.querySelector("input[value='조회하기']") || {}).form;
+if (!form) { return null; }
+var params = [];
+new FormData(form).forEach(function (value, key) { params.push([key, value]); });
+var nf = window.NetFunnel && NetFunnel.TS_HOST
+    ? (NetFunnel.TS_PROTO || 'https') + '://' + NetFunnel.TS_HOST + (NetFunnel.TS_PORT ? ':' + NetFunnel.TS_PORT : '') + '/ts.wseq'
+    : null;
+return {action: form.action, method: (form.method || 'get').toLowerCase(), params: params,
+        userAgent: navigator.userAgent, referer: location.href, netfunnel: nf};
+"""
+
+
+class HttpPoller:
+    """
+    로그인된 브라우저의 쿠키와 조회 폼 값으로 조회 결과 페이지를 HTTP 로 직접 받아온다.
+    크롬이 페이지를 다시 그리지 않으므로 조회당 CPU/메모리가 훨씬 적다.
+    페이지처럼 조회마다 NetFunnel 키를 새로 받아 실어 보내고, 대기열에 걸리거나 키를 받지 못하면
+    그 조회는 브라우저에 맡긴다 (대기 팝업 처리). 좌석을 누르는 일도 브라우저에 맡긴다.
+
+    :param timeout: 요청 제한 시간 (초)
+    """
+
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+        self.session = requests.Session()
+        # 같은 호스트 하나만 부르므로 연결 하나를 계속 재사용 (keep-alive)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.form = None
+
+    def sync(self, driver):
+        """
+        브라우저의 쿠키, User-Agent, 조회 폼 값을 가져온다. 폼을 채운 뒤나 브라우저로 조회한 뒤 호출한다.
+
+        :return: 조회 폼을 찾았는지 여부
+        """
+        form = driver.execute_script(SEARCH_FORM_JS)
+        if not form:
+            return False
+        self.form = form
+        self.session.cookies.clear()
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+        self.session.headers.update({"User-Agent": form["userAgent"], "Referer": form["referer"],
+                                     "Accept-Encoding": "gzip, deflate"})
+        return True
+
+    def netfunnel(self, opcode, **params):
+        """
+        NetFunnel 서버에 요청을 한 번 보낸다.
+
+        :return: (상태 코드, {키: 값})
+        :raise ValueError: 응답 형식을 알 수 없을 때
+        """
+        query = {"opcode": opcode, "nfid": "0", "prefix": f"NetFunnel.gRtype={opcode};", "js": "true",
+                 "_": str(int(time.time() * 1000))}
+        query.update(params)
+        response = self.session.get(self.form.get("netfunnel") or NETFUNNEL_URL, params=query, timeout=self.timeout)
+        response.raise_for_status()
+        match = NETFUNNEL_RESULT.search(response.text)
+        if match is None:
+            raise ValueError("NetFunnel 응답 형식 오류")
+        return match.group(2), dict(parse_qsl(match.group(3)))
+
+    def enter(self):
+        """
+        조회에 쓸 NetFunnel 키를 새로 받는다.
+
+        :return: 키, 대기열이거나 받지 못했으면 None (브라우저로 조회해야 함)
+        """
+        try:
+            status, fields = self.netfunnel(OPCODE_ENTER, sid=NETFUNNEL_SERVICE, aid=NETFUNNEL_ACTION)
+        except (requests.RequestException, ValueError):
+            return None
+        if status != NETFUNNEL_PASS:
+            return None
+        return fields.get("key")
+
+    def complete(self, key):
+        """조회가 끝나면 페이지처럼 키 사용 완료를 알린다"""
+        try:
+            self.netfunnel(OPCODE_COMPLETE, key=key)
+        except (requests.RequestException, ValueError):
+            pass
+
+    def poll(self):
+        """
+        NetFunnel 키를 받아 조회 요청을 한 번 보낸다.
+
+        :return: (상태, 행 목록, HTML). 상태는 'result', 'netfunnel' (대기열이거나 키 없음, 브라우저로 넘겨야 함),
+                 'loaded' (결과 없음)
+        :raise LoggedOutError: 로그인 페이지로 돌아갔을 때
+        """
+        key = self.enter()
+        if key is None:
+            return "netfunnel", None, None
+        # 폼을 가져올 때 들어 있던 키는 이미 쓴 것이므로 새 키로 바꾼다
+        params = [tuple(pair) for pair in self.form["params"]]
+        key_field = next((name for name, _ in params if "netfunnel" in name.lower()), NETFUNNEL_KEY_FIELD)
+        params = [(name, value) for name, value in params if name != key_field] + [(key_field, key)]
+        try:
+            if self.form["method"] == "post":
+                response = self.session.post(self.form["action"], data=params, timeout=self.timeout)
+            else:
+                response = self.session.get(self.form["action"], params=params, timeout=self.timeout)
+        finally:
+            self.complete(key)
+        response.raise_for_status()
+        # charset 이 없는 응답은 requests 가 ISO-8859-1 로 읽어 좌석 상태 문구가 깨지므로 bytes 를 직접 UTF-8 로 읽는다
+        rows = parse_schedule(response.content)
+        html = response.content.decode("utf-8", errors="replace")
+        if rows is not None:
+            return "result", rows, html
+        if "환영합니다" not in html:
+            raise LoggedOutError("HTTP 조회 중 로그인이 풀림")
+        return "loaded", None, html
+
+    def close(self):
+        self.session.close()
@@ -1,7 +1,8 @@
 import argparse
+import time
 
-def parse_cli_args():
-
+def build_parser():
+    """명령행 인자 정의. job 파일 값도 여기 정의된 type 으로 변환한다"""
     parser = argparse.ArgumentParser(description='')
 
     parser.add_argument("--user", help="Username", type=str, metavar="1234567890")
@@ -14,6 +15,10 @@ def parse_cli_args():
     parser.add_argument("--notify", help="Telegram Notification", action=argparse.BooleanOptionalAction)
     parser.add_argument("--token", help="Telegram Token", type=str)
     parser.add_argument("--chat_id", help="Telegram Chat ID", type=int)
+    parser.add_argument("--control", help="Accept /status /stats /pause /resume /stop commands over Telegram", action=argparse.BooleanOptionalAction)
+    parser.add_argument("--telegram_url", help="Telegram Bot API base url (for local stand-in bot)", type=str)
+    parser.add_argument("--notify_stdout", help="Also print notifications to stdout", action=argparse.BooleanOptionalAction)
+    parser.add_argument("--notify_file", help="Append notifications to this file", type=str)
 
     parser.add_argument("--num", help="no of trains to check", type=int, metavar="2", default=2)
     parser.add_argument("--reserve", help="Reserve or not", action=argparse.BooleanOptionalAction)
@@ -22,9 +27,66 @@ def parse_cli_args():
     parser.add_argument("--senior", help="Reserve senior citizen discount tickets available", action=argparse.BooleanOptionalAction)
     parser.add_argument("--child", help="Reserve child discount tickets available", action=argparse.BooleanOptionalAction)
 
+    parser.add_argument("--latest", help="Latest departure time", type=str, metavar="HH:MM")
+    parser.add_argument("--arrive_by", help="Latest arrival time", type=str, metavar="HH:MM")
+    parser.add_argument("--trains", help="Preferred train numbers, tried first", type=str, metavar="301,305")
+    parser.add_argument("--classes", help="Seat class priority", type=str, metavar="standard,special")
+
     parser.add_argument("--quantity", help="Quantity of tickets", type=int, metavar="1", default=1)
+    parser.add_argument("--adults", help="Number of adult passengers", type=int, metavar="1")
+    parser.add_argument("--seniors", help="Number of senior passengers", type=int, metavar="0")
+    parser.add_argument("--children", help="Number of child passengers", type=int, metavar="0")
+    parser.add_argument("--partial", help="Fall back to smaller groups when seats are short", action=argparse.BooleanOptionalAction)
     parser.add_argument("--car", help="Carriage number of train", type=int, metavar="1", default=0)
+    parser.add_argument("--jobs", help="JSON file of search specs to poll round-robin in one session", type=str, metavar="jobs.json")
+
+    parser.add_argument("--base_url", help="SRT site base url (for local stand-in server)", type=str, default="https://etk.srail.kr")
+    parser.add_argument("--headless", help="Run Chrome headless", action=argparse.BooleanOptionalAction)
+    parser.add_argument("--lean", help="Headless Chrome with static resources blocked and low-memory flags", action=argparse.BooleanOptionalAction)
+
+    parser.add_argument("--session_cache", help="Keep encrypted login cookies to skip login on restart", action=argparse.BooleanOptionalAction)
+
+    parser.add_argument("--chromedriver", help="Path to chromedriver (skips resolution)", type=str)
+    parser.add_argument("--driver_online", help="Allow downloading chromedriver when no matching local one is found", action=argparse.BooleanOptionalAction)
+
+    parser.add_argument("--capture_scope", help="URL regex for selenium-wire capture (repeatable)", type=str, action="append")
+    parser.add_argument("--capture_max", help="Max captured requests kept in memory", type=int, metavar="50", default=50)
+
+    parser.add_argument("--max_rate", help="Max searches per minute", type=float, metavar="120", default=120)
+    parser.add_argument("--active", help="Active polling window HH:MM-HH:MM (repeatable)", type=str, action="append")
 
-    args = parser.parse_args()
+    parser.add_argument("--watchdog", help="Restart the driver after this many seconds without progress", type=int, metavar="300", default=300)
+    parser.add_argument("--max_restarts", help="Maximum recoveries within --restart_window before giving up", type=int, metavar="5", default=5)
+    parser.add_argument("--restart_window", help="Window in seconds for counting recoveries", type=int, metavar="600", default=600)
+    parser.add_argument("--http_poll", help="Poll the schedule over plain HTTP with the browser's cookies; use the browser only to book", action=argparse.BooleanOptionalAction)
+    parser.add_argument("--max_rss", help="Restart Chrome when its process tree memory (PSS) exceeds this many MB (0: off)", type=int, metavar="1024", default=0)
+    parser.add_argument("--max_cpu", help="Reopen the search tab when Chrome CPU use exceeds this many cores (0: off)", type=float, metavar="0.0", default=0.0)
+    parser.add_argument("--latency_drift", help="Reopen the search tab when cycle latency grows this many times (0: off)", type=float, metavar="2.0", default=2.0)
+    parser.add_argument("--recycle_every", help="Reopen the search tab every N cycles (0: off)", type=int, metavar="0", default=0)
+    parser.add_argument("--metrics_log", help="Per-cycle timing JSON-lines file", type=str, metavar="metrics.jsonl")
+    parser.add_argument("--history", help="SQLite file to record seat availability changes", type=str, metavar="history.db")
+    parser.add_argument("--trace", help="Record each cycle's page and decision to a gzip trace file", type=str, metavar="trace.jsonl.gz")
+    parser.add_argument("--trace_max", help="Rotate the trace file after this many MB", type=int, metavar="50", default=50)
+    parser.add_argument("--metrics_prom", help="Prometheus textfile for metrics", type=str, metavar="srt.prom")
+
+    parser.add_argument("--check", help="Validate the arguments and exit without starting a browser", action=argparse.BooleanOptionalAction)
+    return parser
+
+
+def parse_cli_args(argv=None):
+
+    args = build_parser().parse_args(argv)
 
     return args
+
+
+def run_check(args):
+    """--check: 인자를 확인하고 결과를 출력. 종료 코드를 반환"""
+    start = time.perf_counter()
+    from srt_reservation.validation import check_args
+    errors = check_args(args)
+    elapsed = (time.perf_counter() - start) * 1000
+    for error in errors:
+        print(f"오류: {error}")
+    print(f"설정 확인 {'실패' if errors else '통과'} ({elapsed:.1f}ms)")
+    return 1 if errors else 0
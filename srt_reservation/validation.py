@@ -1,2 +1,131 @@
-station_list = ["수서", "동탄", "평택지제", "천안아산", "오송", "대전", "김천(구미)", "동대구",
-                "신경주", "울산(통도사)", "부산", "공주", "익산", "정읍", "광주송정", "나주", "목포"]
+import re
+from datetime import datetime
+
+from srt_reservation.stations import STATIONS, check_route, lookup
+
+station_list = [station.name for station in STATIONS]
+
+MAX_CAR = 10  # SRT 한 편성 객차 수
+TOKEN_PATTERN = re.compile(r"^\d+:[A-Za-z0-9_-]{30,}$")  # 텔레그램 봇 token
+
+
+def check_args(args):
+    """
+    브라우저를 띄우지 않고 실행 인자를 모두 확인한다 (--check).
+
+    :return: 오류 메시지 목록 (비어 있으면 통과)
+    """
+    from srt_reservation.scheduler import parse_window
+
+    errors = []
+
+    def check(fn, *fn_args):
+        try:
+            return fn(*fn_args)
+        except Exception as e:
+            errors.append(str(e))
+            return None
+
+    if not args.user or not args.psw:
+        errors.append("로그인 정보 오류. --user 와 --psw 가 필요합니다.")
+
+    if args.jobs:
+        from srt_reservation.jobs import load_job_args
+        for job_args in check(load_job_args, args.jobs, args) or ():
+            errors.extend(f"[{job_args.name}] {error}" for error in check_search(job_args))
+    else:
+        errors.extend(check_search(args))
+
+    for window in args.active or ():
+        check(parse_window, window)
+    for scope in args.capture_scope or ():
+        check(check_pattern, scope, "--capture_scope")
+
+    check(check_range, args.max_rate, "조회 빈도 오류. --max_rate 는 0 보다 커야 합니다.", 0, None, True)
+    check(check_range, args.capture_max, "캡쳐 수 오류. --capture_max 는 1 이상이어야 합니다.", 1)
+    check(check_range, args.trace_max, "trace 크기 오류. --trace_max 는 1 이상이어야 합니다.", 1)
+    check(check_range, args.watchdog, "watchdog 오류. --watchdog 은 1 이상이어야 합니다.", 1)
+    check(check_range, args.max_restarts, "복구 횟수 오류. --max_restarts 는 0 이상이어야 합니다.", 0)
+    check(check_range, args.restart_window, "복구 구간 오류. --restart_window 는 1 이상이어야 합니다.", 1)
+    check(check_range, args.max_rss, "메모리 상한 오류. --max_rss 는 0(사용 안 함) 이상이어야 합니다.", 0)
+    check(check_range, args.max_cpu, "CPU 상한 오류. --max_cpu 는 0(사용 안 함) 이상이어야 합니다.", 0)
+    check(check_range, args.latency_drift, "지연 배수 오류. --latency_drift 는 0(사용 안 함) 이상이어야 합니다.", 0)
+    check(check_range, args.recycle_every, "탭 재생성 주기 오류. --recycle_every 는 0(사용 안 함) 이상이어야 합니다.", 0)
+
+    if args.notify:
+        if not args.token or not TOKEN_PATTERN.match(args.token):
+            errors.append("텔레그램 token 오류. --notify 에는 '숫자:문자열' 형태의 --token 이 필요합니다.")
+        if args.chat_id is None:
+            errors.append("텔레그램 chat_id 오류. --notify 에는 --chat_id 가 필요합니다.")
+    elif args.control:
+        errors.append("--control 은 --notify 와 함께 사용해야 합니다.")
+    return errors
+
+
+def check_search(args):
+    """
+    조회 조건 인자(역, 날짜, 시간, 인원, 정책)를 확인한다. job 파일이면 job 마다 호출한다.
+
+    :return: 오류 메시지 목록
+    """
+    from srt_reservation.passengers import Passengers
+    from srt_reservation.policy import SelectionPolicy
+
+    errors = []
+
+    def check(fn, *fn_args):
+        try:
+            return fn(*fn_args)
+        except Exception as e:
+            errors.append(str(e))
+            return None
+
+    dpt = check(lookup, args.dpt, "출발역")
+    arr = check(lookup, args.arr, "도착역")
+    if dpt is not None and arr is not None:
+        check(check_route, dpt, arr)
+
+    if not str(args.dt).isnumeric():
+        errors.append("날짜는 숫자로만 이루어져야 합니다.")
+    else:
+        try:
+            if datetime.strptime(str(args.dt), '%Y%m%d').date() < datetime.now().date():
+                errors.append(f"날짜 오류. {args.dt} 은/는 이미 지난 날짜입니다.")
+        except ValueError:
+            errors.append("날짜가 잘못 되었습니다. YYYYMMDD 형식으로 입력해주세요.")
+
+    if not str(args.tm).isnumeric() or not 0 <= int(args.tm) <= 23:
+        errors.append(f"시간 오류. '{args.tm}' 은/는 00~23 사이의 시각이어야 합니다.")
+    else:
+        check(SelectionPolicy.from_args, args)
+
+    if check(check_range, args.quantity, "수량 오류. --quantity 는 1 이상이어야 합니다.", 1) is not None:
+        check(Passengers.from_args, args)
+    check(check_range, args.car, f"호차 오류. --car 는 0(상관없음) 또는 1~{MAX_CAR} 이어야 합니다.", 0, MAX_CAR)
+    check(check_range, args.num, "열차 수 오류. --num 은 1 이상이어야 합니다.", 1)
+    return errors
+
+
+def check_range(value, message, low, high=None, exclusive=False):
+    """
+    숫자 인자가 범위 안인지 확인한다. 숫자가 아니어도 같은 오류로 알린다.
+
+    :param message: 범위를 벗어났을 때 오류 메시지 (뒤에 값이 붙는다)
+    :param exclusive: low 와 같은 값도 범위 밖으로 본다
+    :raise ValueError: 범위를 벗어났을 때
+    """
+    try:
+        inside = (low < value if exclusive else low <= value) and (high is None or value <= high)
+    except TypeError:
+        inside = False
+    if not inside:
+        raise ValueError(f"{message} ({value!r})")
+    return value
+
+
+def check_pattern(pattern, option):
+    """정규식 인자가 컴파일되는지 확인한다"""
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"정규식 오류. {option} '{pattern}' 을/를 해석할 수 없습니다. ({e})")
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# 대기 지점별 (최대 대기 초, 폴링 간격 초)
+WAIT_SITES = {
+    "login_form": (10, 0.1),
+    "login_result": (10, 0.2),
+    "search_form": (15, 0.1),
+    "search_result": (15, 0.05),
+    "netfunnel": (1800, 0.5),
+    "booking_result": (10, 0.02),  # 좌석 클릭부터 예약 확인 페이지까지
+}
+
+
+class Waiter:
+    """
+    implicitly_wait 대신 호출 지점마다 명시적인 제한 시간과 폴링 간격으로 기다린다.
+    생성 시 implicit wait 를 0 으로 설정하므로 find_element 는 더 이상 멈추지 않는다.
+    대기 시간은 지점별 히스토그램(wait_<지점>)으로 기록되고, 시간 초과는 지점과 조건을 출력한다.
+
+    :param driver: selenium 드라이버
+    :param metrics: Metrics
+    :param sites: WAIT_SITES 를 덮어쓸 {지점: (최대 대기 초, 폴링 간격 초)}
+    :param heartbeat: progress_every 마다 호출할 함수 (긴 대기 중에도 살아 있음을 알림)
+    """
+
+    def __init__(self, driver, metrics, sites=None, heartbeat=None):
+        self.driver = driver
+        self.metrics = metrics
+        self.heartbeat = heartbeat
+        self.sites = dict(WAIT_SITES, **(sites or {}))
+        driver.implicitly_wait(0)
+
+    def until(self, site, condition, timeout=None, progress_every=None, ignored_exceptions=None):
+        """
+        condition 이 참이 될 때까지 기다리고 그 값을 반환. 시간 초과 시 TimeoutException.
+
+        :param site: 대기 지점 이름 (WAIT_SITES 키)
+        :param condition: WebDriverWait 조건
+        :param timeout: 지점 기본값 대신 쓸 최대 대기 초
+        :param progress_every: 긴 대기일 때 진행 상황을 출력할 간격 (초)
+        :param ignored_exceptions: 폴링 중 무시할 예외 (페이지 이동 중 스크립트 실행 오류 등)
+        """
+        max_wait, poll = self.sites[site]
+        if timeout is not None:
+            max_wait = timeout
+        start = time.perf_counter()
+        try:
+            while True:
+                elapsed = time.perf_counter() - start
+                remaining = max_wait - elapsed
+                step = remaining if progress_every is None else min(remaining, progress_every)
+                try:
+                    return WebDriverWait(self.driver, max(step, 0), poll_frequency=poll,
+                                         ignored_exceptions=ignored_exceptions).until(condition)
+                except TimeoutException:
+                    if step >= remaining:
+                        raise
+                    print(f"{site} 대기 중... {time.perf_counter() - start:.0f}초")
+                    if self.heartbeat is not None:
+                        self.heartbeat()
+        except TimeoutException:
+            self.metrics.inc(f"wait_timeouts_{site}")
+            print(f"대기 시간 초과: {site} ({max_wait}초) 조건: {_describe(condition)}")
+            raise
+        finally:
+            self.metrics.observe(f"wait_{site}", time.perf_counter() - start)
+
+
+def _describe(condition):
+    name = getattr(condition, "__qualname__", None) or type(condition).__qualname__
+    locator = getattr(condition, "locator", None)
+    return f"{name} {locator}" if locator else name